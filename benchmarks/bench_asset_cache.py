@@ -0,0 +1,63 @@
+"""Static asset cache benchmark: hit ratio and network bytes per page, cold versus warm cache.
+
+Run with this package importable as backend.workers.parser:
+    python -m backend.workers.parser.benchmarks.bench_asset_cache --pages 5 https://lolalytics.com/lol/tierlist/
+"""
+import time
+import asyncio
+import argparse
+import tempfile
+from backend.workers.parser.helpers.asset_cache import AssetCache
+from backend.workers.parser.helpers.playwright_browser import PlaywrightBrowser
+
+
+async def run_pass(urls: list[str], pages: int, directory: str) -> dict[str, float]:
+    """Loads every URL ``pages`` times on a fresh browser sharing the cache directory."""
+    cache = AssetCache(directory)
+    browser = PlaywrightBrowser(asset_cache=cache)
+    await browser.setup()
+
+    started = time.perf_counter()
+    loads = 0
+    try:
+        for _ in range(pages):
+            for url in urls:
+                async with browser.lease_page("bench_asset_cache") as page:
+                    await page.goto(url, wait_until="load", timeout=60000)
+                loads += 1
+    finally:
+        await browser.close()
+
+    return {
+        "hit_ratio": cache.stats.hit_ratio,
+        "fetched_per_page": cache.stats.bytes_fetched / loads,
+        "served_per_page": cache.stats.bytes_served / loads,
+        "seconds_per_page": (time.perf_counter() - started) / loads,
+    }
+
+
+async def run(urls: list[str], pages: int, directory: str) -> dict[str, dict[str, float]]:
+    # The cold pass starts from an empty directory; the warm pass reuses what it stored, as another worker would
+    return {"cold": await run_pass(urls, pages, directory), "warm": await run_pass(urls, pages, directory)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--pages", type=int, default=3, help="loads per URL in each pass")
+    parser.add_argument("--cache-dir", help="cache directory (default: a fresh temporary one)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = asyncio.run(run(args.urls, args.pages, args.cache_dir or tmp))
+
+    print(f"{'pass':<8}{'hit_ratio':>10}{'KiB fetched/page':>18}{'KiB cached/page':>17}{'s/page':>8}")
+    for name, result in results.items():
+        print(f"{name:<8}{result['hit_ratio']:>10.2%}{result['fetched_per_page'] / 1024:>18.1f}{result['served_per_page'] / 1024:>17.1f}{result['seconds_per_page']:>8.2f}")
+
+    cold, warm = results["cold"]["fetched_per_page"], results["warm"]["fetched_per_page"]
+    if cold: print(f"static bytes transferred per page: {warm / cold - 1:+.1%} warm vs cold")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Records parser entry points to HAR archives, then times them replayed offline.
+
+Run with this package importable as backend.workers.parser:
+    python -m backend.workers.parser.benchmarks.bench_har record --har-dir hars
+    python -m backend.workers.parser.benchmarks.bench_har replay --har-dir hars --runs 10 --latency 0.05
+"""
+import time
+import asyncio
+import argparse
+import statistics
+from typing import Any, Callable
+from backend.workers.parser.helpers.har_archive import HarArchive
+from backend.workers.parser.helpers.page_metrics import percentile
+from backend.workers.parser.helpers.sharded_runner import create_parser
+
+# Entry point -> (parser name, call arguments built from the command line)
+ENTRY_POINTS: dict[str, tuple[str, Callable[[argparse.Namespace], dict[str, Any]]]] = {
+    "parse_meta_stats": ("lolalytics", lambda args: {"tier": args.tier}),
+    "parse_counters_stats": ("lolalytics", lambda args: {"champion": args.champion, "tier": args.tier}),
+    "parse_champion_build": ("lolalytics", lambda args: {"champion": args.champion, "tier": args.tier}),
+    "parse_player_stats": ("deeplol", lambda args: {"url": args.player_url}),
+}
+
+
+def add_entry_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--entries", nargs="+", default=list(ENTRY_POINTS), choices=list(ENTRY_POINTS))
+    parser.add_argument("--champion", default="Jax")
+    parser.add_argument("--tier", default="master_plus")
+    parser.add_argument("--player-url", default="https://www.deeplol.gg/summoner/euw/Faker-KR1")
+
+
+async def run_entry(entry: str, args: argparse.Namespace, har: HarArchive, runs: int) -> list[float]:
+    """Calls one entry point ``runs`` times on a parser whose context records or replays ``har``."""
+    parser_name, arguments = ENTRY_POINTS[entry]
+    parser = create_parser(parser_name, None, {"har": har})
+    await parser.setup()
+
+    timings = []
+    try:
+        for _ in range(runs):
+            started = time.perf_counter()
+            result = await getattr(parser, entry)(**arguments(args))
+            timings.append(time.perf_counter() - started)
+            if result is None: print(f"{entry}: no result")
+    finally:
+        # Closing the context is what writes a recorded archive
+        await parser.close()
+
+    return timings
+
+
+async def run(args: argparse.Namespace) -> dict[str, list[float]]:
+    results = {}
+    for entry in args.entries:
+        har = HarArchive.for_entry(args.har_dir, entry, mode=args.mode, latency=args.latency, jitter=args.jitter, seed=args.seed)
+        results[entry] = await run_entry(entry, args, har, 1 if args.mode == "record" else args.runs)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--har-dir", default="hars")
+    parser.add_argument("--runs", type=int, default=5, help="timed calls per entry point when replaying")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every replayed response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per response")
+    parser.add_argument("--seed", type=int, default=0)
+    add_entry_arguments(parser)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    print(f"{'entry point':<24}{'runs':>6}{'median':>10}{'p90':>10}{'max':>10}   (seconds, {args.mode})")
+    for entry, timings in results.items():
+        print(f"{entry:<24}{len(timings):>6}{statistics.median(timings):>10.3f}{percentile(timings, 90):>10.3f}{max(timings):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Parser benchmark suite: latency percentiles, round trips, bytes, peak RSS and CPU per entry point.
+
+Runs every entry point against HAR fixtures recorded with bench_har, writes JSON results and a text
+report, and fails when a metric regresses past the tolerance against a stored baseline.
+
+Run with this package importable as backend.workers.parser:
+    python -m backend.workers.parser.benchmarks.bench_har record --har-dir hars
+    python -m backend.workers.parser.benchmarks.bench_parsers --har-dir hars --output bench.json
+    python -m backend.workers.parser.benchmarks.bench_parsers --har-dir hars --baseline bench.json --tolerance 0.15
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import resource
+from typing import Any, Optional
+from backend.workers.parser.benchmarks.bench_har import ENTRY_POINTS, add_entry_arguments
+from backend.workers.parser.helpers.har_archive import HarArchive
+from backend.workers.parser.helpers.page_metrics import PageMetricsRecorder, percentile, job_metrics
+from backend.workers.parser.helpers.recycle_policy import descendant_rss
+from backend.workers.parser.helpers.protocol_trace import ProtocolTrace
+from backend.workers.parser.helpers.sharded_runner import create_parser
+
+# Metrics where a higher value is a regression; everything reported is "lower is better"
+GATED = ("wall_p50", "wall_p90", "round_trips", "bytes", "cpu_seconds", "browser_peak_rss_mb")
+
+
+class RssSampler:
+    """Tracks the peak RSS of the browser processes while a benchmark runs.
+
+    Each /proc scan runs in a worker thread of this process; ``cpu_seconds`` is the CPU those scans used,
+    for callers to take out of their own process CPU time. Exiting waits for the scan in flight.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak = 0
+        self.cpu_seconds = 0.0
+        self._stopped = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def _measure(self) -> int:
+        started = time.thread_time()
+        rss = descendant_rss() or 0
+        self.cpu_seconds += time.thread_time() - started
+        return rss
+
+    async def _sample(self):
+        while not self._stopped.is_set():
+            self.peak = max(self.peak, await asyncio.to_thread(self._measure))
+            try:
+                await asyncio.wait_for(self._stopped.wait(), self.interval)
+            except TimeoutError:
+                pass
+
+    async def __aenter__(self) -> "RssSampler":
+        self._task = asyncio.create_task(self._sample())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._stopped.set()
+        await self._task
+
+
+async def bench_entry(entry: str, args: argparse.Namespace) -> dict[str, Any]:
+    """Times ``args.runs`` calls after ``args.warmup`` untimed ones on a parser replaying the entry's HAR."""
+    parser_name, arguments = ENTRY_POINTS[entry]
+    har = HarArchive.for_entry(args.har_dir, entry, mode="replay", latency=args.latency, jitter=args.jitter, seed=args.seed)
+    recorder = PageMetricsRecorder()
+    # Every leased page sits behind the trace proxy, so round trips include goto, waits and clicks too
+    trace = ProtocolTrace()
+    parser = create_parser(parser_name, None, {"har": har, "metrics": recorder, "trace": trace})
+    await parser.setup()
+
+    walls, round_trips, transferred, failures = [], [], [], 0
+    try:
+        for _ in range(args.warmup): await getattr(parser, entry)(**arguments(args))
+
+        cpu_started = time.process_time()
+        async with RssSampler() as sampler:
+            for _ in range(args.runs):
+                calls = trace.total_calls
+                started = time.perf_counter()
+                with job_metrics() as metrics:
+                    result = await getattr(parser, entry)(**arguments(args))
+                walls.append(time.perf_counter() - started)
+                round_trips.append(trace.total_calls - calls)
+                transferred.append(sum(sample.bytes_received for sample in metrics))
+                if result is None: failures += 1
+        cpu = time.process_time() - cpu_started - sampler.cpu_seconds
+    finally:
+        await parser.close()
+
+    if args.trace_top: print(f"\n{entry}: protocol calls per caller and slowest selectors\n{trace.report(args.trace_top)}\n")
+
+    return {
+        "runs": args.runs,
+        "failures": failures,
+        "wall_p50": percentile(walls, 50),
+        "wall_p90": percentile(walls, 90),
+        "wall_p99": percentile(walls, 99),
+        "round_trips": percentile(round_trips, 50),
+        "bytes": percentile(transferred, 50),
+        "cpu_seconds": cpu / args.runs,
+        "browser_peak_rss_mb": sampler.peak / 2 ** 20,
+        # ru_maxrss is in KiB on Linux and the high-water mark of the whole process so far
+        "python_peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Lists every gated metric that grew more than ``tolerance`` (a fraction) over the baseline."""
+    regressions = []
+    for entry, metrics in results["entries"].items():
+        base = baseline.get("entries", {}).get(entry)
+        if not base: continue
+        for name in GATED:
+            if not base.get(name): continue
+            change = metrics[name] / base[name] - 1
+            if change > tolerance: regressions.append(f"{entry}.{name}: {base[name]:.4g} -> {metrics[name]:.4g} ({change:+.1%})")
+    return regressions
+
+
+def report(results: dict[str, Any]) -> str:
+    lines = [f"{'entry point':<24}{'p50 s':>8}{'p90 s':>8}{'p99 s':>8}{'trips':>7}{'KiB':>9}{'cpu s':>8}{'rss MiB':>9}{'fail':>6}"]
+    for entry, m in results["entries"].items():
+        lines.append(f"{entry:<24}{m['wall_p50']:>8.3f}{m['wall_p90']:>8.3f}{m['wall_p99']:>8.3f}{m['round_trips']:>7}"
+                     f"{m['bytes'] / 1024:>9.1f}{m['cpu_seconds']:>8.3f}{m['browser_peak_rss_mb']:>9.1f}{m['failures']:>6}")
+    return "\n".join(lines)
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    entries = {entry: await bench_entry(entry, args) for entry in args.entries}
+    return {"meta": {"python": platform.python_version(), "machine": platform.machine(), "latency": args.latency, "runs": args.runs}, "entries": entries}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--har-dir", default="hars")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write machine-readable results to this JSON file")
+    parser.add_argument("--report", default="bench_output.txt", help="text report path")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed growth per gated metric, as a fraction")
+    parser.add_argument("--trace-top", type=int, default=0, help="print protocol calls per caller and the N slowest selectors per entry point")
+    add_entry_arguments(parser)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    text = report(results)
+
+    if args.baseline:
+        with open(args.baseline) as f: regressions = compare(results, json.load(f), args.tolerance)
+        text += "\n\n" + ("\n".join(["Regressions:"] + regressions) if regressions else f"No regressions against {args.baseline}")
+    else:
+        regressions = []
+
+    print(text)
+    with open(args.report, "w") as f: f.write(text + "\n")
+    if args.output:
+        with open(args.output, "w") as f: json.dump(results, f, indent=2)
+
+    if regressions: sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Scaling curves of the parser entry points against the synthetic fixture site.
+
+For each list size, serves fixture pages of that size and times the entry point that reads them, reporting
+seconds per item and the local growth exponent (1 is linear, 2 quadratic) between consecutive sizes.
+
+Run with this package importable as backend.workers.parser:
+    python -m backend.workers.parser.benchmarks.bench_scaling --sizes 25 50 100 200 300 --runs 3
+"""
+import math
+import time
+import asyncio
+import argparse
+import statistics
+from dataclasses import replace
+from typing import Any
+from backend.workers.parser.benchmarks.fixture_site import FixtureSite, FixtureConfig
+from backend.workers.parser.helpers.protocol_trace import ProtocolTrace
+from backend.workers.parser.helpers.sharded_runner import create_parser
+
+# Entry point -> (parser name, FixtureConfig field it scales with, call arguments given the fixture base URL)
+SCALED = {
+    "parse_meta_stats": ("lolalytics", "tierlist_rows", lambda base_url: {"tier": "master_plus"}),
+    "parse_counters_stats": ("lolalytics", "counters", lambda base_url: {"champion": "Jax", "tier": "master_plus"}),
+    "parse_champion_build": ("lolalytics", "cards", lambda base_url: {"champion": "Jax", "tier": "master_plus"}),
+    "parse_player_stats": ("deeplol", "champion_rows", lambda base_url: {"url": f"{base_url}summoner/euw/Player-EUW"}),
+}
+
+
+async def measure(entry: str, config: FixtureConfig, runs: int, extraction: str) -> dict[str, Any]:
+    """Median wall time and protocol round trips of ``runs`` calls against a site generated from ``config``."""
+    parser_name, _, arguments = SCALED[entry]
+
+    async with FixtureSite(config) as site:
+        trace = ProtocolTrace()
+        options: dict[str, Any] = {"extraction": extraction, "trace": trace}
+        if parser_name == "lolalytics": options["base_url"] = site.base_url
+        parser = create_parser(parser_name, None, options)
+        await parser.setup()
+
+        walls, trips = [], []
+        try:
+            for _ in range(runs):
+                before = trace.total_calls
+                started = time.perf_counter()
+                await getattr(parser, entry)(**arguments(site.base_url))
+                walls.append(time.perf_counter() - started)
+                trips.append(trace.total_calls - before)
+        finally:
+            await parser.close()
+
+    return {"wall": statistics.median(walls), "round_trips": statistics.median(trips)}
+
+
+async def run(args: argparse.Namespace) -> dict[str, list[tuple[int, dict[str, Any]]]]:
+    curves = {}
+    for entry in args.entries:
+        _, field, _ = SCALED[entry]
+        base = FixtureConfig(batch=args.batch, render_delay=args.render_delay)
+        curves[entry] = [(size, await measure(entry, replace(base, **{field: size}), args.runs, args.extraction)) for size in args.sizes]
+    return curves
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", nargs="+", default=list(SCALED), choices=list(SCALED))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[25, 50, 100, 200, 300])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--batch", type=int, default=20, help="items rendered per lazy-load step")
+    parser.add_argument("--render-delay", type=float, default=0.05, help="seconds before each lazy batch renders")
+    parser.add_argument("--extraction", default="live", help="parser extraction mode")
+    args = parser.parse_args()
+
+    curves = asyncio.run(run(args))
+
+    for entry, points in curves.items():
+        print(f"\n{entry} (scaling {SCALED[entry][1]})")
+        print(f"{'size':>6}{'seconds':>10}{'ms/item':>10}{'trips':>8}{'exponent':>10}")
+        previous = None
+        for size, result in points:
+            exponent = "-"
+            if previous and previous[1] and size != previous[0]: exponent = f"{math.log(result['wall'] / previous[1]) / math.log(size / previous[0]):.2f}"
+            print(f"{size:>6}{result['wall']:>10.3f}{1000 * result['wall'] / size:>10.2f}{result['round_trips']:>8.0f}{exponent:>10}")
+            previous = (size, result["wall"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Throughput of the sharded runner for 1..N worker processes on this machine.
+
+Run with this package importable as backend.workers.parser:
+    python -m backend.workers.parser.benchmarks.bench_sharding --max-processes 4 --champions Jax Darius Garen Ahri --repeat 3
+"""
+import os
+import time
+import argparse
+from backend.workers.parser.helpers.sharded_runner import ShardedRunner, Job
+
+METHODS = ("parse_counters_stats", "parse_champion_build")
+
+
+def measure(jobs: list[Job], processes: int, concurrency: int) -> dict[str, float]:
+    """Runs the whole job list once, including worker and browser startup."""
+    started = time.perf_counter()
+    results = ShardedRunner(processes=processes, concurrency=concurrency).run(jobs)
+    elapsed = time.perf_counter() - started
+
+    return {"seconds": elapsed, "jobs_per_second": len(jobs) / elapsed, "failed": sum(1 for result in results if result.error)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--champions", nargs="+", default=["Jax", "Darius", "Garen", "Ahri"])
+    parser.add_argument("--tier", default="master_plus")
+    parser.add_argument("--method", default="parse_counters_stats", choices=METHODS)
+    parser.add_argument("--repeat", type=int, default=2, help="times each champion is queued")
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--concurrency", type=int, default=2, help="jobs in flight per process")
+    args = parser.parse_args()
+
+    jobs = [Job("lolalytics", args.method, {"champion": champion, "tier": args.tier}) for champion in args.champions * args.repeat]
+
+    print(f"{'processes':<11}{'seconds':>9}{'jobs/s':>9}{'speedup':>9}{'failed':>8}   ({len(jobs)} x {args.method})")
+    baseline = None
+    for processes in range(1, args.max_processes + 1):
+        result = measure(jobs, processes, args.concurrency)
+        baseline = baseline or result["jobs_per_second"]
+        print(f"{processes:<11}{result['seconds']:>9.2f}{result['jobs_per_second']:>9.2f}{result['jobs_per_second'] / baseline:>8.2f}x{result['failed']:>8}")
+
+
+if __name__ == "__main__":
+    main()
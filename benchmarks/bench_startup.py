@@ -0,0 +1,63 @@
+"""Startup-time benchmark comparing Chromium launch profiles.
+
+Run with this package importable as backend.workers.parser:
+    python -m backend.workers.parser.benchmarks.bench_startup --runs 5 --profiles headless-shell headless
+
+With ``--endpoint`` an extra "daemon" row times attaching to a running browser_daemon instead of launching.
+"""
+import time
+import asyncio
+import argparse
+import statistics
+from typing import Optional
+from backend.workers.parser.helpers.launch_profiles import PROFILES
+from backend.workers.parser.helpers.browser_manager import BrowserManager
+from backend.workers.parser.helpers.playwright_browser import PlaywrightBrowser
+
+
+async def measure(profile: str, endpoint: Optional[str] = None) -> dict[str, float]:
+    """Times one cold start: launch (or connect), context and first blank page, then shutdown."""
+    browser = PlaywrightBrowser(manager=BrowserManager(profile=profile, endpoint=endpoint))
+
+    started = time.perf_counter()
+    await browser.setup()
+    launched = time.perf_counter()
+
+    async with browser.lease_page("bench_startup") as page:
+        await page.goto("about:blank")
+    ready = time.perf_counter()
+
+    await browser.close()
+    closed = time.perf_counter()
+
+    return {"setup": launched - started, "first_page": ready - launched, "total": ready - started, "close": closed - ready}
+
+
+async def run(profiles: list[str], runs: int, endpoint: Optional[str] = None) -> dict[str, dict[str, float]]:
+    results = {}
+    targets = [(profile, profile, None) for profile in profiles]
+    if endpoint: targets.append(("daemon", "headless-shell", endpoint))
+
+    for name, profile, target in targets:
+        samples = [await measure(profile, target) for _ in range(runs)]
+        results[name] = {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", nargs="+", default=["headless-shell", "headless"], choices=list(PROFILES))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--endpoint", help="CDP endpoint of a running browser_daemon, e.g. http://127.0.0.1:9222")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.profiles, args.runs, args.endpoint))
+
+    print(f"{'profile':<16}{'setup':>10}{'first_page':>12}{'total':>10}{'close':>10}   (median of {args.runs}, seconds)")
+    for profile, timings in results.items():
+        print(f"{profile:<16}{timings['setup']:>10.3f}{timings['first_page']:>12.3f}{timings['total']:>10.3f}{timings['close']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
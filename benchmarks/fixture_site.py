@@ -0,0 +1,366 @@
+"""Synthetic lolalytics and deeplol pages at configurable sizes, served locally for scale tests.
+
+Pages reproduce the markup and selectors the parsers rely on, with deterministic generated data.
+Long lists render in batches as they are scrolled, like the real sites, after ``render_delay`` seconds.
+The lolalytics pages also embed every list in full as ``qwik/json`` state, unless ``qwik_state`` is off,
+and the deeplol pages render from JSON API responses (``/api/summoner/...``) they fetch after loading.
+
+Run with this package importable as backend.workers.parser:
+    python -m backend.workers.parser.benchmarks.fixture_site --port 8080 --cards 300 --champion-rows 500
+
+then point the parsers at it: ``LolalyticsParser(base_url="http://127.0.0.1:8080/")`` and
+``parse_player_stats("http://127.0.0.1:8080/summoner/euw/Player-EUW")``.
+"""
+import json
+import random
+import asyncio
+import argparse
+from html import escape
+from urllib.parse import quote
+from dataclasses import dataclass
+from typing import Optional, Any
+from aiohttp import web
+
+LANES = ("top", "jungle", "middle", "bottom", "support")
+TIERS = ("S+", "S", "S-", "A+", "A", "A-", "B+", "B", "C")
+RANKS = ("Iron", "Bronze", "Silver", "Gold", "Platinum", "Emerald", "Diamond", "Master")
+
+# Appends ``batch`` pending items to a list whenever its scroller nears the end, after ``delay`` ms
+LAZY_JS = """
+function lazyList(scroller, track, items, horizontal, batch, delay) {
+    const state = {items: items.slice(), busy: false};
+    const nearEnd = () => horizontal
+        ? scroller.scrollLeft + scroller.clientWidth >= scroller.scrollWidth - 200
+        : window.innerHeight + window.scrollY >= document.documentElement.scrollHeight - 200;
+    const more = () => {
+        if (state.busy || !state.items.length || !nearEnd()) return;
+        state.busy = true;
+        setTimeout(() => {
+            track.insertAdjacentHTML('beforeend', state.items.splice(0, batch).join(''));
+            state.busy = false;
+            more();
+        }, delay);
+    };
+    (horizontal ? scroller : window).addEventListener('scroll', more, {passive: true});
+    state.reset = (next) => {
+        track.innerHTML = next.slice(0, batch).join('');
+        state.items = next.slice(batch);
+        if (horizontal) scroller.scrollLeft = 0;
+    };
+    return state;
+}
+"""
+
+
+@dataclass
+class FixtureConfig:
+    """Sizes of every generated list plus the lazy-rendering behaviour."""
+    tierlist_rows: int = 200
+    counters: int = 60
+    cards: int = 40
+    lanes: int = 5
+    champion_rows: int = 50
+    batch: int = 20
+    render_delay: float = 0.05
+    qwik_state: bool = True
+    seed: int = 0
+
+
+def page(body: str, script: str = "", style: str = "", state: Optional[Any] = None) -> str:
+    state = f"<script type='qwik/json'>{qwik_json(state)}</script>" if state is not None else ""
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><style>body{{margin:0;font:12px sans-serif}}{style}</style></head>"
+            f"<body>{body}<script>{LAZY_JS}{script}</script>{state}</body></html>")
+
+
+def script_json(value: Any) -> str:
+    # Escaped so embedded markup can never close the surrounding script element
+    return json.dumps(value).replace("</", "<\\/")
+
+
+def qwik_json(value: Any) -> str:
+    """Serializes ``value`` as Qwik does: a flat ``objs`` table whose containers reference strings and
+    other containers by base-36 index, with numbers inline."""
+    objs: list[Any] = []
+
+    def add(item: Any) -> Any:
+        if item is None or isinstance(item, (bool, int, float)): return item
+        index = len(objs)
+        objs.append(None)
+        if isinstance(item, dict): objs[index] = {key: add(member) for key, member in item.items()}
+        elif isinstance(item, list): objs[index] = [add(member) for member in item]
+        else: objs[index] = str(item)
+        return base36(index)
+
+    add(value)
+    return script_json({"refs": {}, "ctx": {}, "objs": objs, "subs": []})
+
+
+def base36(number: int) -> str:
+    digits = ""
+    while True:
+        number, digit = divmod(number, 36)
+        digits = "0123456789abcdefghijklmnopqrstuvwxyz"[digit] + digits
+        if not number: return digits
+
+
+class FixtureSite:
+    """aiohttp application generating the pages; use as ``async with FixtureSite(config) as site: site.base_url``."""
+
+    def __init__(self, config: Optional[FixtureConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FixtureConfig()
+        self.host = host
+        self.port = port
+        self.runner: Optional[web.AppRunner] = None
+        self.app = web.Application()
+        self.app.router.add_get("/lol/tierlist/", self.tierlist)
+        self.app.router.add_get("/lol/{champion}/counters/", self.counters)
+        self.app.router.add_get("/lol/{champion}/build/", self.build)
+        self.app.router.add_get("/summoner/{region}/{name}", self.profile)
+        self.app.router.add_get("/summoner/{region}/{name}/champions", self.champions)
+        self.app.router.add_get("/api/summoner/summoner", self.profile_api)
+        self.app.router.add_get("/api/summoner/champion", self.champions_api)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+
+    def rng(self, *key: str) -> random.Random:
+        """A generator seeded per page, so the same URL always yields the same data."""
+        return random.Random(f"{self.config.seed}:{':'.join(key)}")
+
+    def lazy(self, element_id: str, items: list[str], horizontal: bool = False) -> tuple[str, str]:
+        """Returns the first batch of items inline and a script rendering the rest on scroll."""
+        batch, delay = self.config.batch, int(self.config.render_delay * 1000)
+        scroller = f"document.getElementById('{element_id}')" if horizontal else "window"
+        track = f"document.querySelector('#{element_id} > div')" if horizontal else f"document.getElementById('{element_id}')"
+        script = f"window.lazy = window.lazy || {{}}; window.lazy['{element_id}'] = lazyList({scroller}, {track}, {script_json(items[batch:])}, {str(horizontal).lower()}, {batch}, {delay});"
+        return "".join(items[:batch]), script
+
+    # lolalytics
+
+    def state(self, request: web.Request, **lists: Any) -> Optional[dict[str, Any]]:
+        """Page state as Qwik would embed it: the full lists next to unrelated records, such as the search index."""
+        if not self.config.qwik_state: return None
+        search = [{"name": f"Champ{index}", "slug": f"champ{index}"} for index in range(max(self.config.tierlist_rows, self.config.counters))]
+        return {"url": str(request.rel_url), "search": search, **lists}
+
+    async def tierlist(self, request: web.Request) -> web.Response:
+        rng = self.rng("tierlist", request.query.get("tier", ""))
+        champions, rows = [], []
+        for index in range(self.config.tierlist_rows):
+            champion = {"name": f"Champ{index}", "tier": rng.choice(TIERS), "lane": rng.choice(LANES), "wr": round(rng.uniform(45, 56), 2),
+                        "wrDelta": round(rng.uniform(-2, 2), 2), "pr": round(rng.uniform(0.5, 20), 2), "br": round(rng.uniform(0, 30), 2),
+                        "rank": rng.randint(1, 99), "games": rng.randint(1000, 300000)}
+            champions.append(champion)
+            rows.append(
+                f"<div style='height:32px;display:flex;gap:8px'><div>{index + 1}</div><div><img alt='champ{index}'></div><div>{champion['name']}</div>"
+                f"<div>{champion['tier']}</div><div>{champion['lane']}</div><div><div><span>{champion['wr']:.2f}</span><span>{champion['wrDelta']:.2f}</span></div></div>"
+                f"<div>{champion['pr']:.2f}</div><div>{champion['br']:.2f}</div><div>{champion['rank']}</div><div>{champion['games']}</div></div>"
+            )
+
+        first, script = self.lazy("rows", rows)
+        header = "<div>Rank</div><div>Filters</div>"
+        body = f"<main>{'<div></div>' * 5}<div id='rows'>{header}{first}</div></main>"
+        return web.Response(text=page(body, script, state=self.state(request, tierlist=champions)), content_type="text/html")
+
+    async def counters(self, request: web.Request) -> web.Response:
+        champion = request.match_info["champion"]
+        rng = self.rng("counters", champion)
+        counters = [
+            {"name": f"Champ{index}", "wr": round(rng.uniform(40, 60), 2), "d1": round(rng.uniform(-5, 5), 2), "d2": round(rng.uniform(-5, 5), 2),
+             "avgWr": round(rng.uniform(45, 55), 2), "games": rng.randint(100, 50000)}
+            for index in range(self.config.counters)
+        ]
+        cards = "".join(
+            f"<span><div><a href='/lol/{champion}/vs/{counter['name'].lower()}/build/'><div>"
+            f"<div>{counter['name']}</div><div>{counter['wr']:.2f}</div>"
+            f"<div><span>Δ1{counter['d1']:.2f}</span><span>Δ2{counter['d2']:.2f}</span></div>"
+            f"<div>{counter['avgWr']:.2f}</div><div>{counter['games']}</div>"
+            f"</div></a></div></span>"
+            for counter in counters
+        )
+
+        body = f"<main><div class='flex flex-wrap justify-between'>{cards}</div></main>"
+        return web.Response(text=page(body, state=self.state(request, counters=counters)), content_type="text/html")
+
+    def build_cards(self, champion: str, lane: str, flag: str) -> list[dict[str, Any]]:
+        rng = self.rng("build", champion, lane, flag)
+        return [
+            {"name": f"{flag[:4]}{lane[:3]}{index}".capitalize(), "wr": round(rng.uniform(40, 60), 2), "d1": round(rng.uniform(-5, 5), 2),
+             "d2": round(rng.uniform(-5, 5), 2), "pr": round(rng.uniform(0.1, 10), 2), "games": rng.randint(100, 20000)}
+            for index in range(self.config.cards)
+        ]
+
+    @staticmethod
+    def card_markup(champion: str, card: dict[str, Any], flag: str) -> str:
+        other = card["name"].lower()
+        href = f"/lol/{champion}/vs/{other}/build/" if flag == "matchup" else f"/lol/{other}/build/"
+        return (f"<div style='display:inline-block;width:80px'><a href='{href}'>{escape(other)}</a>"
+                f"<div class='my-1'>{card['wr']:.2f}</div><div class='my-1'>{card['d1']:.2f}</div>"
+                f"<div class='my-1'>{card['d2']:.2f}</div><div class='my-1'>{card['pr']:.2f}</div>"
+                f"<div class='text-[9px] text-[#bbb]'>{card['games']}</div></div>")
+
+    async def build(self, request: web.Request) -> web.Response:
+        champion = request.match_info["champion"]
+        lanes = LANES[:self.config.lanes] if self.config.lanes <= len(LANES) else [f"lane{index}" for index in range(self.config.lanes)]
+        rows, scripts, teammates, state = [], [], {}, {"matchups": {}, "teammates": {}}
+
+        for index, lane in enumerate(lanes):
+            element_id = f"carousel{index}"
+            state["matchups"][lane], state["teammates"][lane] = self.build_cards(champion, lane, "matchup"), self.build_cards(champion, lane, "teammates")
+            first, script = self.lazy(element_id, [self.card_markup(champion, card, "matchup") for card in state["matchups"][lane]], horizontal=True)
+            teammates[element_id] = [self.card_markup(champion, card, "teammates") for card in state["teammates"][lane]]
+            scripts.append(script)
+            rows.append(
+                f"<div><div><img alt='{lane}'></div>"
+                f"<div id='{element_id}' class='cursor-grab overflow-y-hidden overflow-x-scroll' style='width:600px;overflow-x:scroll;white-space:nowrap'>"
+                f"<div>{first}</div></div></div>"
+            )
+
+        rng = self.rng("objectives", champion)
+        state["objectives"] = {
+            name: {"secure": round(rng.uniform(20, 80), 1), "secureWin": round(rng.uniform(40, 60), 1), "yield": round(rng.uniform(20, 80), 1), "yieldWin": round(rng.uniform(40, 60), 1)}
+            for name in ("Dragon", "Herald", "Baron", "Tower")
+        }
+        objectives = "".join(
+            f"<tr><td>{name}</td><td>{values['secure']:.1f}</td><td>{values['secureWin']:.1f}</td><td>{values['yield']:.1f}</td><td>{values['yieldWin']:.1f}</td></tr>"
+            for name, values in state["objectives"].items()
+        )
+
+        toggle = "<div><div>Common</div><div><div class='flex flex-auto justify-items-stretch'><div id='teammates'>Teammates</div><div>Matchups</div></div></div></div>"
+        body = (f"<main><div class='m-auto'><div>{toggle}{''.join(rows)}</div></div>"
+                f"<div class='mb-2 break-inside-avoid'><table><tbody>{objectives}</tbody></table></div></main>")
+
+        delay = int(self.config.render_delay * 1000)
+        scripts.append(
+            f"const teammates = {script_json(teammates)};"
+            f"document.getElementById('teammates').addEventListener('click', () => setTimeout(() => {{"
+            f"for (const [id, cards] of Object.entries(teammates)) window.lazy[id].reset(cards); }}, {delay}));"
+        )
+        return web.Response(text=page(body, "".join(scripts), style="main{min-height:1200px}", state=self.state(request, **state)), content_type="text/html")
+
+    # deeplol: pages render client-side once the JSON API response they fetch has arrived, like the React app
+
+    def api_script(self, api: str, region: str, name: str, render: str) -> str:
+        """Fetches the page's API endpoint, then runs ``render`` after ``render_delay``."""
+        url = f"/api/summoner/{api}?platform_id={quote(region)}&riot_id={quote(name)}"
+        return f"fetch({script_json(url)}).then((r) => r.json()).then(() => setTimeout(() => {{ {render} }}, {int(self.config.render_delay * 1000)}));"
+
+    def profile_data(self, name: str) -> dict[str, Any]:
+        rng = self.rng("profile", name)
+        queues = []
+        for queue_type in ("RANKED_SOLO_5x5", "RANKED_FLEX_SR"):
+            wins, losses = rng.randint(10, 400), rng.randint(10, 400)
+            queues.append({"queue_type": queue_type, "tier": f"{rng.choice(RANKS)} {rng.randint(1, 4)}", "lp": rng.randint(0, 99),
+                           "wins": wins, "losses": losses, "win_rate": round(100 * wins / (wins + losses), 1)})
+        return {"summoner_basic_info_dict": {"riot_id_name": name, "puu_id": f"puuid-{name.lower()}"}, "season_tier_info_dict": queues}
+
+    async def profile_api(self, request: web.Request) -> web.Response:
+        return web.json_response(self.profile_data(request.query.get("riot_id", "")))
+
+    async def profile(self, request: web.Request) -> web.Response:
+        region, name = request.match_info["region"], request.match_info["name"]
+        queues = "".join(
+            f"<div><span class='tier_color'>{queue['tier']}</span><span class='sc-jTYOmA kvFqjw'>{queue['lp']} LP</span>"
+            f"<span class='sc-lvMlV cFAxaZ'>{queue['wins']}W {queue['losses']}L</span>"
+            f"<div class='sc-jcFjpl dhxdJc'><span class='sc-lvMlV cFAxaZ'>{queue['win_rate']:.1f}%</span></div></div>"
+            for queue in self.profile_data(name)["season_tier_info_dict"]
+        )
+
+        markup = f"<span class='sc-kTwdzw iERSzQ'>{escape(name)}</span><div class='sc-iUKqMP iKKtPF'>{queues}</div>"
+        script = self.api_script("summoner", region, name, f"document.getElementById('root').innerHTML = {script_json(markup)};")
+        return web.Response(text=page("<div id='root'></div>", script), content_type="text/html")
+
+    def champion_data(self, name: str, queue: str) -> list[dict[str, Any]]:
+        rng = self.rng("champions", name, queue)
+        champions = []
+        for index in range(self.config.champion_rows):
+            kills, deaths, assists = rng.uniform(1, 12), rng.uniform(1, 10), rng.uniform(1, 15)
+            wins, losses = rng.randint(0, 80), rng.randint(0, 80)
+            champions.append({
+                "position": rng.choice(LANES), "champion_name": f"Champ{index}", "wins": wins, "losses": losses,
+                "win_rate": round(100 * wins / max(wins + losses, 1), 1), "kills": round(kills, 1), "deaths": round(deaths, 1),
+                "assists": round(assists, 1), "kda": round((kills + assists) / deaths, 2), "damage_per_min": rng.randint(200, 1200),
+                "gold_per_min": rng.randint(200, 600), "cs_per_min": round(rng.uniform(3, 10), 1), "wards": round(rng.uniform(0.2, 2), 1),
+                "damage_share": round(rng.uniform(5, 40), 1),
+            })
+        return champions
+
+    async def champions_api(self, request: web.Request) -> web.Response:
+        name = request.query.get("riot_id", "")
+        return web.json_response({"champion_stats": {queue_type: self.champion_data(name, queue) for queue, queue_type in (("solo", "RANKED_SOLO_5x5"), ("flex", "RANKED_FLEX_SR"))}})
+
+    def champion_rows(self, name: str, queue: str) -> list[str]:
+        rows = ["<tr class='close'><th>Pos</th><th>Champion</th><th>W/L</th><th>WR</th><th>KDA</th><th>DMG</th><th>Gold</th><th>CS</th><th>Wards</th><th>Share</th></tr>"]
+        for champion in self.champion_data(name, queue):
+            rows.append(
+                f"<tr class='close'><td><span class='normal'>{champion['position']}</span></td>"
+                f"<td><span class='sc-JkixQ eZQvao champName'>{champion['champion_name']}</span></td>"
+                f"<td><span class='win'>{champion['wins']}W</span><span class='lose'>{champion['losses']}L</span></td>"
+                f"<td><div class='winrate'>{champion['win_rate']:.1f}%</div></td>"
+                f"<td><div class='kda'><p>{champion['kills']:.1f} / {champion['deaths']:.1f} / {champion['assists']:.1f}</p></div><span class='kda_color'>{champion['kda']:.2f}</span></td>"
+                f"<td><div class='sc-jFkmsu dZiPNg'>{champion['damage_per_min']}</div></td>"
+                f"<td><span class='normal'>{champion['gold_per_min']}</span></td>"
+                f"<td><span class='normal'>{champion['cs_per_min']:.1f}</span></td>"
+                f"<td><span class='normal'>{champion['wards']:.1f}</span></td>"
+                f"<td><span class='normal'>{champion['damage_share']:.1f}%</span></td></tr>"
+            )
+        return rows
+
+    async def champions(self, request: web.Request) -> web.Response:
+        region, name = request.match_info["region"], request.match_info["name"]
+        tables = {queue: "".join(self.champion_rows(name, queue)) for queue in ("solo", "flex")}
+
+        tabs = ("<div class='sc-fnAgPf iLhZbD'><div class='sc-bvcFEq kEzVtI' data-queue='solo'>Solo</div></div>"
+                "<div class='sc-fnAgPf bLYGgq'><div class='sc-bvcFEq kEzVtI' data-queue='flex'>Flex</div></div>")
+        body = f"<div id='root'>{tabs}<table><tbody id='champions'></tbody></table></div>"
+        # The table is rendered once the champions API answered, and each tab swaps it in place
+        script = (
+            f"const tables = {script_json(tables)};"
+            f"const show = (queue) => {{ document.getElementById('champions').innerHTML = tables[queue]; }};"
+            f"for (const tab of document.querySelectorAll('[data-queue]')) tab.addEventListener('click', () => show(tab.dataset.queue));"
+            + self.api_script("champion", region, name, "show('solo');")
+        )
+        return web.Response(text=page(body, script), content_type="text/html")
+
+    async def start(self) -> "FixtureSite":
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        # Port 0 binds an ephemeral port; read back the one the OS picked
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self.runner: await self.runner.cleanup()
+        self.runner = None
+
+    async def __aenter__(self) -> "FixtureSite":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+
+async def serve(config: FixtureConfig, host: str, port: int):
+    async with FixtureSite(config, host=host, port=port) as site:
+        print(f"Fixture site serving at {site.base_url}")
+        await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    for name, default in vars(FixtureConfig()).items():
+        if isinstance(default, bool): parser.add_argument(f"--{name.replace('_', '-')}", action=argparse.BooleanOptionalAction, default=default)
+        else: parser.add_argument(f"--{name.replace('_', '-')}", type=type(default), default=default)
+    args = parser.parse_args()
+
+    config = FixtureConfig(**{name: getattr(args, name) for name in vars(FixtureConfig())})
+    asyncio.run(serve(config, args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
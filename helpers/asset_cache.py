@@ -0,0 +1,151 @@
+"""Cross-process on-disk cache for static assets, served through context.route."""
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import tempfile
+from dataclasses import dataclass
+from typing import Optional, Any
+from playwright.async_api import BrowserContext, Route
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+CACHEABLE_TYPES = frozenset({"script", "stylesheet", "font"})
+
+# Headers describing the transfer rather than the content; the cached body is stored decoded
+TRANSFER_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive", "set-cookie"})
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters and the bytes served from disk versus fetched over the network."""
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    stored: int = 0
+    bytes_served: int = 0
+    bytes_fetched: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def write_atomic(path: str, data: bytes):
+    """Writes through a temporary file and rename, so concurrent readers in other processes never see partial files."""
+    directory = os.path.dirname(path)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f: f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp): os.unlink(tmp)
+        raise
+
+
+def content_headers(headers: dict[str, str]) -> dict[str, str]:
+    return {key: value for key, value in headers.items() if key.lower() not in TRANSFER_HEADERS}
+
+
+class AssetCache:
+    """Static asset cache shared by every worker process pointing at the same directory.
+
+    ``index/<sha256(url)>.json`` maps a URL to the SHA-256 of its body and response metadata;
+    ``blobs/<content hash>`` holds each distinct body once. Entries expire after ``max_age`` seconds.
+    Register it before a RoutePolicy so the policy still decides what may load at all. Over a replaying HAR
+    archive attach it with ``fetch_misses=False``: ``route.fetch`` bypasses the routes beneath, so misses
+    must fall through to the archive instead of reaching the network.
+    """
+
+    def __init__(self, directory: str, resource_types: frozenset[str] = CACHEABLE_TYPES, max_age: float = 24 * 3600):
+        self.directory = directory
+        self.resource_types = resource_types
+        self.max_age = max_age
+        self.stats = CacheStats()
+        os.makedirs(os.path.join(directory, "index"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "blobs"), exist_ok=True)
+
+    def _index_path(self, url: str) -> str:
+        return os.path.join(self.directory, "index", hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def _blob_path(self, content_hash: str) -> str:
+        return os.path.join(self.directory, "blobs", content_hash)
+
+    def load(self, url: str) -> Optional[tuple[dict[str, Any], bytes]]:
+        """Returns a fresh entry's metadata and body, or None."""
+        try:
+            with open(self._index_path(url), "rb") as f: entry = json.loads(f.read())
+            if time.time() - entry["stored_at"] > self.max_age: return None
+            with open(self._blob_path(entry["content_hash"]), "rb") as f: body = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+
+        return entry, body
+
+    def store(self, url: str, status: int, headers: dict[str, str], body: bytes):
+        content_hash = hashlib.sha256(body).hexdigest()
+        blob = self._blob_path(content_hash)
+        if not os.path.exists(blob): write_atomic(blob, body)
+
+        entry = {
+            "url": url,
+            "content_hash": content_hash,
+            "status": status,
+            "headers": content_headers(headers),
+            "stored_at": time.time(),
+        }
+        write_atomic(self._index_path(url), json.dumps(entry).encode())
+        self.stats.stored += 1
+
+    async def handle(self, route: Route, *, fetch_misses: bool = True):
+        """Serves cacheable GETs from disk, fetching and storing them on a miss (falling back without ``fetch_misses``)."""
+        request = route.request
+        if request.method != "GET" or request.resource_type not in self.resource_types:
+            await route.fallback()
+            return
+
+        cached = await asyncio.to_thread(self.load, request.url)
+        if cached:
+            entry, body = cached
+            self.stats.hits += 1
+            self.stats.bytes_served += len(body)
+            await route.fulfill(status=entry["status"], headers=entry["headers"], body=body)
+            return
+
+        self.stats.misses += 1
+        if not fetch_misses:
+            await route.fallback()
+            return
+
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except Exception as e:
+            # An exception escaping a route handler leaves the request pending, so it is answered here
+            logging.debug(f"Failed to fetch {request.url}: {e}")
+            self.stats.errors += 1
+            await self._abort(route)
+            return
+
+        self.stats.bytes_fetched += int(response.headers.get("content-length", len(body)))
+
+        if response.status == 200:
+            try:
+                await asyncio.to_thread(self.store, request.url, response.status, response.headers, body)
+            except OSError as e:
+                logging.warning(f"Failed to cache {request.url}: {e}")
+
+        await route.fulfill(status=response.status, headers=content_headers(response.headers), body=body)
+
+    @staticmethod
+    async def _abort(route: Route):
+        try:
+            await route.abort()
+        except Exception as e:
+            logging.debug(f"Failed to abort {route.request.url}: {e}")
+
+    async def attach(self, context: BrowserContext, fetch_misses: bool = True):
+        await context.route("**/*", lambda route: self.handle(route, fetch_misses=fetch_misses))
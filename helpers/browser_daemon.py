@@ -0,0 +1,86 @@
+"""Long-lived Chromium that parser processes attach to over CDP instead of launching their own.
+
+Run with this package importable as backend.workers.parser:
+    python -m backend.workers.parser.helpers.browser_daemon --port 9222 --profile headless-shell
+
+Workers then connect with ``BrowserManager(endpoint="http://127.0.0.1:9222")``; each gets its own context.
+"""
+import signal
+import asyncio
+import logging
+import argparse
+from typing import Optional, Union
+from playwright.async_api import async_playwright, Browser
+from backend.workers.parser.helpers.launch_profiles import LaunchProfile, PROFILES, get_profile
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+
+class BrowserDaemon:
+    """Keeps one Chromium with a remote debugging port alive, relaunching it whenever it exits."""
+
+    def __init__(self, port: int = 9222, host: str = "127.0.0.1", profile: Union[str, LaunchProfile] = "headless-shell", restart_delay: float = 1.0):
+        self.port = port
+        self.host = host
+        self.profile = get_profile(profile)
+        self.restart_delay = restart_delay
+        self.browser: Optional[Browser] = None
+        self.launches = 0
+        self._stopping = asyncio.Event()
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def launch_options(self) -> dict:
+        options = self.profile.launch_options()
+        options["args"] = options["args"] + [f"--remote-debugging-port={self.port}", f"--remote-debugging-address={self.host}"]
+        return options
+
+    async def serve(self):
+        """Runs until stop() is called, relaunching the browser after crashes."""
+        async with async_playwright() as playwright:
+            while not self._stopping.is_set():
+                disconnected = asyncio.Event()
+                self.browser = await playwright.chromium.launch(**self.launch_options())
+                self.browser.on("disconnected", lambda _: disconnected.set())
+                self.launches += 1
+                logging.info(f"Browser daemon serving CDP at {self.endpoint} (profile {self.profile.name}, launch {self.launches})")
+
+                stop = asyncio.create_task(self._stopping.wait())
+                crash = asyncio.create_task(disconnected.wait())
+                await asyncio.wait({stop, crash}, return_when=asyncio.FIRST_COMPLETED)
+                stop.cancel()
+                crash.cancel()
+
+                if self._stopping.is_set(): break
+                logging.warning(f"Browser exited unexpectedly, relaunching in {self.restart_delay}s")
+                await asyncio.sleep(self.restart_delay)
+
+            if self.browser and self.browser.is_connected(): await self.browser.close()
+            self.browser = None
+            logging.info("Browser daemon stopped")
+
+    def stop(self):
+        self._stopping.set()
+
+
+async def run(port: int, host: str, profile: str):
+    daemon = BrowserDaemon(port=port, host=host, profile=profile)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM): loop.add_signal_handler(sig, daemon.stop)
+    await daemon.serve()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=9222)
+    parser.add_argument("--host", default="127.0.0.1", help="address the debugging port binds to; CDP is unauthenticated, keep it private")
+    parser.add_argument("--profile", default="headless-shell", choices=list(PROFILES))
+    args = parser.parse_args()
+
+    asyncio.run(run(args.port, args.host, args.profile))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Shared, reference-counted Chromium process for several PlaywrightBrowser instances."""
+import asyncio
+import logging
+from typing import Optional, Union
+from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
+from backend.workers.parser.helpers.launch_profiles import LaunchProfile, get_profile
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+
+class BrowserManager:
+    """Owns one Playwright driver and Chromium process, launched on first acquire and closed on last release.
+
+    Pass the same manager to several parsers so they share a single browser, each keeping its own
+    isolated context:
+
+        manager = BrowserManager()
+        lolalytics, deeplol = LolalyticsParser(browser_manager=manager), DeepLOLParser(browser_manager=manager)
+
+    With an ``endpoint`` (see helpers/browser_daemon.py) nothing is launched: the manager connects over CDP
+    to a browser that outlives this process, and reconnects with backoff when that connection drops.
+    """
+
+    def __init__(self, profile: Union[str, LaunchProfile] = "headless-shell", endpoint: Optional[str] = None, connect_attempts: int = 5, connect_backoff: float = 0.5):
+        self.profile = get_profile(profile)
+        self.endpoint = endpoint
+        self.connect_attempts = connect_attempts
+        self.connect_backoff = connect_backoff
+        self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self.refs = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> Browser:
+        """Returns the shared browser, launching or connecting it for the first holder and after a disconnect."""
+        async with self._lock:
+            if not self.browser or not self.browser.is_connected():
+                await self._start()
+                try:
+                    self.browser = await (self.connect() if self.endpoint else self.launch())
+                except BaseException:
+                    await self._stop_if_unused()
+                    raise
+                if self.endpoint: logging.info(f"Connected to browser daemon at {self.endpoint}")
+                else: logging.info(f"Shared browser launched with profile {self.profile.name}")
+
+            self.refs += 1
+            return self.browser
+
+    async def acquire_persistent(self, user_data_dir: str, **context_options) -> BrowserContext:
+        """Launches a dedicated browser on a persistent profile directory and returns its only context.
+
+        The context keeps cookies and storage across runs. Registering any context.route handler (as
+        PlaywrightBrowser always does) disables Chromium's HTTP cache, so the profile does not keep cached
+        responses; AssetCache is the only cache in effect. A profile directory can only be opened by one
+        browser at a time, so it is not shared (nor taken from the endpoint, which launches locally
+        regardless); call release() after closing the context.
+        """
+        async with self._lock:
+            await self._start()
+            try:
+                context = await self.playwright.chromium.launch_persistent_context(user_data_dir, **self.profile.launch_options(), **context_options)
+            except BaseException:
+                await self._stop_if_unused()
+                raise
+
+            self.refs += 1
+            return context
+
+    async def _start(self):
+        if not self.playwright: self.playwright = await async_playwright().start()
+
+    async def _stop_if_unused(self):
+        if self.refs or not self.playwright: return
+        await self.playwright.stop()
+        self.playwright = None
+
+    async def launch(self) -> Browser:
+        """Initialize browser with the profile's anti-detection and resource settings."""
+        return await self.playwright.chromium.launch(**self.profile.launch_options())
+
+    async def connect(self) -> Browser:
+        """Connects to the endpoint over CDP, retrying with exponential backoff while the daemon (re)starts."""
+        for attempt in range(self.connect_attempts):
+            try:
+                browser = await self.playwright.chromium.connect_over_cdp(self.endpoint)
+                browser.on("disconnected", lambda _: logging.warning(f"Lost connection to browser daemon at {self.endpoint}"))
+                return browser
+            except Exception as e:
+                if attempt == self.connect_attempts - 1: raise
+                delay = self.connect_backoff * 2 ** attempt
+                logging.warning(f"Connecting to {self.endpoint} failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def release(self):
+        """Drops one holder, closing the browser once nobody holds it."""
+        async with self._lock:
+            if not self.refs: return
+            self.refs -= 1
+            if self.refs: return
+
+            # Closing a connected browser only drops our contexts and the connection; the daemon keeps running
+            if self.browser and self.browser.is_connected(): await self.browser.close()
+            self.browser = None
+            await self._stop_if_unused()
+            logging.info("Disconnected from browser daemon" if self.endpoint else "Shared browser closed")
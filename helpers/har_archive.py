@@ -0,0 +1,57 @@
+"""HAR record and replay of a browser context's traffic, with injectable latency."""
+import os
+import random
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+from playwright.async_api import BrowserContext, Route
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+HAR_MODES = ("record", "replay")
+
+
+@dataclass
+class HarArchive:
+    """One HAR file a context records into or replays from.
+
+    In ``record`` mode every request matching ``url`` goes to the network and is saved, bodies embedded,
+    when the context closes. In ``replay`` mode matching requests are served from the file and anything
+    missing is aborted, so runs never touch the network. Each replayed response is delayed by ``latency``
+    plus up to ``jitter`` seconds, drawn from a generator seeded with ``seed`` for repeatable runs.
+
+    The file is written on context close, so keep one archive per context (and no recycle policy) when recording.
+    """
+    path: str
+    mode: str = "replay"
+    url: Optional[str] = None
+    latency: float = 0.0
+    jitter: float = 0.0
+    seed: int = 0
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if self.mode not in HAR_MODES: raise ValueError(f"Unknown HAR mode: {self.mode}. Available: {', '.join(HAR_MODES)}")
+        self._rng = random.Random(self.seed)
+
+    @classmethod
+    def for_entry(cls, directory: str, entry: str, **options) -> "HarArchive":
+        """The archive of one parser entry point, ``<directory>/<entry>.har``."""
+        return cls(path=os.path.join(directory, f"{entry}.har"), **options)
+
+    async def delay(self, route: Route):
+        await asyncio.sleep(self.latency + self._rng.uniform(0, self.jitter))
+        await route.fallback()
+
+    async def attach(self, context: BrowserContext):
+        if self.mode == "record":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            await context.route_from_har(self.path, url=self.url, update=True, update_content="embed", update_mode="minimal")
+            logging.info(f"Recording HAR to {self.path}")
+            return
+
+        if not os.path.exists(self.path): raise FileNotFoundError(f"HAR archive not found: {self.path}; record it first")
+        await context.route_from_har(self.path, url=self.url, not_found="abort")
+        # Registered after the HAR route, so it runs first and holds each request before the HAR answers it
+        if self.latency or self.jitter: await context.route(self.url or "**/*", self.delay)
@@ -0,0 +1,62 @@
+"""Offline extraction over a one-shot HTML snapshot of a page."""
+import re
+import logging
+from typing import Optional, Any
+from bs4 import BeautifulSoup, Tag
+from playwright.async_api import Page
+from backend.workers.parser.helpers.js_extractor import FieldSpec
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+NON_NUMERIC = re.compile(r"[^0-9.\-]")
+
+
+def to_number(text: Optional[str]) -> Optional[float]:
+    """Python twin of the in-page number() helper: keeps digits, dots and minus signs."""
+    if text is None: return None
+    cleaned = NON_NUMERIC.sub("", text)
+    try:
+        return float(cleaned) if cleaned else None
+    except ValueError:
+        return None
+
+
+class HtmlSnapshot:
+    """Page HTML parsed with lxml and queried through soupsieve CSS selectors.
+
+    Field specs evaluate exactly as the compiled in-page extractors do (textContent, trimmed, with the
+    same number cleaning), so a parser can switch between live and snapshot extraction per call.
+    """
+
+    def __init__(self, html: str, url: Optional[str] = None):
+        self.url = url
+        self.soup = BeautifulSoup(html, "lxml")
+
+    @classmethod
+    async def capture(cls, page: Page) -> "HtmlSnapshot":
+        """Serializes the current DOM of a page in a single round trip."""
+        return cls(await page.content(), url=page.url)
+
+    def select(self, selector: str, parent: Optional[Tag] = None) -> list[Tag]:
+        return (parent or self.soup).select(selector)
+
+    def text(self, selector: str, parent: Optional[Tag] = None) -> Optional[str]:
+        element = (parent or self.soup).select_one(selector)
+        return element.get_text().strip() if element else None
+
+    def number(self, selector: str, parent: Optional[Tag] = None) -> Optional[float]:
+        return to_number(self.text(selector, parent))
+
+    def extract(self, row_selector: str, spec: FieldSpec) -> list[list[Any]]:
+        """Evaluates a field spec for every row, returning value arrays in spec order."""
+        rows = []
+
+        for row in self.select(row_selector):
+            values = []
+            for _, selector, value_type in spec:
+                if not selector: values.append(None)
+                elif value_type == "number": values.append(self.number(selector, row))
+                else: values.append(self.text(selector, row))
+            rows.append(values)
+
+        return rows
@@ -0,0 +1,140 @@
+"""Browserless fetch backend over a pooled aiohttp session."""
+import asyncio
+import logging
+from http.cookies import SimpleCookie
+from dataclasses import dataclass, field
+from typing import Optional, Callable, Awaitable, Any
+import aiohttp
+from yarl import URL
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+@dataclass
+class FetchStats:
+    """Counters for an HttpFetcher."""
+    requests: int = 0
+    failures: int = 0
+    rejected: int = 0
+    bytes_received: int = 0
+    harvests: int = 0
+
+
+@dataclass
+class SessionState:
+    """Cookies (in Playwright's ``context.cookies()`` format) and headers handed from a browser to HTTP."""
+    cookies: list[dict[str, Any]] = field(default_factory=list)
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class HttpFetcher:
+    """Fetches server-rendered pages without a browser.
+
+    One ClientSession is kept for the fetcher's lifetime, so connections are reused (keep-alive) and
+    capped per host. Bodies are transferred compressed and decompressed by aiohttp.
+
+    With a ``harvester`` (typically ``PlaywrightBrowser.harvest_session``), ``reharvest_after`` consecutive
+    failed fetches make the fetcher pull fresh cookies and headers from a real browser session and retry.
+    A fetch fails on errors, on statuses other than 200, and when ``parse`` finds nothing usable in the body:
+    consent and challenge pages answer 200, so only extracting the page's data proves the session works.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 8, timeout: float = 15.0, keepalive_timeout: float = 30.0, headers: Optional[dict[str, str]] = None,
+                 harvester: Optional[Callable[[], Awaitable[SessionState]]] = None, reharvest_after: int = 3):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.harvester = harvester
+        self.reharvest_after = reharvest_after
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.stats = FetchStats()
+        self._failures_in_row = 0
+        self._harvest_lock = asyncio.Lock()
+
+    async def setup(self):
+        connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host, keepalive_timeout=self.keepalive_timeout, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector, headers=self.headers, timeout=aiohttp.ClientTimeout(total=self.timeout))
+
+    async def close(self):
+        if self.session: await self.session.close()
+        self.session = None
+
+    def load_session(self, state: SessionState):
+        """Adopts a browser session's cookies and headers for every later request."""
+        jar = self.session.cookie_jar
+
+        for cookie in state.cookies:
+            morsel = SimpleCookie()
+            morsel[cookie["name"]] = cookie["value"]
+            morsel[cookie["name"]]["domain"] = cookie.get("domain", "")
+            morsel[cookie["name"]]["path"] = cookie.get("path", "/")
+            if cookie.get("secure"): morsel[cookie["name"]]["secure"] = True
+            jar.update_cookies(morsel, response_url=URL(f"https://{cookie.get('domain', '').lstrip('.')}/"))
+
+        self.headers.update(state.headers)
+        self.session.headers.update(state.headers)
+        logging.info(f"Loaded browser session with {len(state.cookies)} cookies")
+
+    async def reharvest(self):
+        """Refreshes the session from the harvester; concurrent callers share one harvest."""
+        harvests = self.stats.harvests
+
+        async with self._harvest_lock:
+            if self.stats.harvests != harvests: return
+            self.load_session(await self.harvester())
+            self.stats.harvests += 1
+            self._failures_in_row = 0
+
+    async def fetch(self, url: str, parse: Optional[Callable[[str], Any]] = None) -> Optional[Any]:
+        """Returns ``parse(body)`` of a 200 response (the body itself without ``parse``), or None on error,
+        other statuses or when ``parse`` returns None."""
+        result = await self._fetch(url, parse)
+
+        if result is not None:
+            self._failures_in_row = 0
+            return result
+
+        self._failures_in_row += 1
+        if not self.harvester or self._failures_in_row < self.reharvest_after: return None
+
+        try:
+            await self.reharvest()
+        except Exception as e:
+            logging.warning(f"Session harvest failed: {e}")
+            return None
+
+        return await self._fetch(url, parse)
+
+    async def _fetch(self, url: str, parse: Optional[Callable[[str], Any]]) -> Optional[Any]:
+        self.stats.requests += 1
+
+        try:
+            async with self.session.get(url) as response:
+                if response.status != 200:
+                    logging.info(f"HTTP {response.status} for {url}")
+                    self.stats.failures += 1
+                    return None
+
+                body = await response.read()
+                self.stats.bytes_received += int(response.headers.get("Content-Length", len(body)))
+                html = body.decode(response.get_encoding(), errors="replace")
+
+        except (aiohttp.ClientError, TimeoutError) as e:
+            logging.warning(f"HTTP fetch failed for {url}: {e}")
+            self.stats.failures += 1
+            return None
+
+        if not parse: return html
+
+        result = parse(html)
+        if result is None: self.stats.rejected += 1
+        return result
@@ -0,0 +1,111 @@
+"""Compiles declarative field specs into in-page JavaScript extractors."""
+import json
+from functools import lru_cache
+from typing import Optional, Any
+
+FieldSpec = tuple[tuple[str, Optional[str], Optional[str]], ...]
+
+NUMBER_JS = """(text) => {
+        if (text === null) return null;
+        const cleaned = text.replace(/[^0-9.\\-]/g, '');
+        if (!cleaned) return null;
+        const value = Number(cleaned);
+        return Number.isNaN(value) ? null : value;
+    }"""
+
+
+def field_spec(fields: dict[str, tuple[Any, ...]]) -> FieldSpec:
+    """Reduces a fields dict to the hashable (name, selector, value_type) part that is compiled to JS."""
+    spec = []
+    for name, (selector, value_type, *_) in fields.items():
+        if selector and value_type not in ("text", "number"): raise ValueError(f"Unsupported value_type: {value_type}")
+        spec.append((name, selector or None, value_type if selector else None))
+    return tuple(spec)
+
+
+def field_expression(selector: Optional[str], value_type: Optional[str], row: str = "row") -> str:
+    """Builds the JS expression reading one field relative to the ``row`` element."""
+    if not selector: return "null"
+    text = f"text({row}.querySelector({json.dumps(selector)}))"
+    return f"number({text})" if value_type == "number" else text
+
+
+def row_function(spec: FieldSpec) -> str:
+    """Builds the JS arrow function mapping one element to its value array."""
+    columns = ",\n        ".join(field_expression(selector, value_type) for _, selector, value_type in spec)
+    return f"""(row) => [
+        {columns}
+    ]"""
+
+
+@lru_cache(maxsize=None)
+def compile_extractor(spec: FieldSpec) -> str:
+    """Compiles a field spec into a JS function returning one value array per row.
+
+    The function accepts a single element or an array of elements (as passed by eval_on_selector_all),
+    and returns values in spec order so the payload carries no repeated keys.
+    """
+    return f"""(target) => {{
+    const number = {NUMBER_JS};
+    const text = (el) => el ? el.textContent.trim() : null;
+    const extract = {row_function(spec)};
+    const rows = Array.isArray(target) ? target : [target];
+    return rows.map(extract);
+}}"""
+
+
+@lru_cache(maxsize=None)
+def compile_scroll_collector(spec: FieldSpec, item_selector: str, key_selector: str = "a") -> str:
+    """Compiles a field spec into a JS function draining horizontally scrolling containers.
+
+    Each container is scrolled to its end in-page while a MutationObserver extracts every item matching
+    ``item_selector`` as it renders. Items are deduplicated by the href of ``key_selector``, and each
+    container resolves to ``[href, ...values]`` arrays, so a whole carousel costs one round trip.
+    """
+    return f"""async (containers, {{delay, deadline}}) => {{
+    const number = {NUMBER_JS};
+    const text = (el) => el ? el.textContent.trim() : null;
+    const extract = {row_function(spec)};
+    const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+    const drain = async (container) => {{
+        const seen = new Map();
+        const collect = () => {{
+            for (const item of container.querySelectorAll({json.dumps(item_selector)})) {{
+                const key = item.querySelector({json.dumps(key_selector)});
+                const href = key ? key.getAttribute('href') : null;
+                if (!href || seen.has(href)) continue;
+                seen.set(href, [href, ...extract(item)]);
+            }}
+        }};
+        const observer = new MutationObserver(collect);
+        observer.observe(container, {{childList: true, subtree: true, characterData: true}});
+        const started = performance.now();
+
+        try {{
+            collect();
+            while (container.scrollLeft + container.clientWidth < container.scrollWidth - 5) {{
+                if (performance.now() - started >= deadline) break;
+                const before = container.scrollLeft;
+                container.scrollLeft += Math.max(container.clientWidth - 100, 100);
+                await sleep(delay);
+                collect();
+                if (container.scrollLeft === before) break;
+            }}
+        }} finally {{
+            observer.disconnect();
+        }}
+        return Array.from(seen.values());
+    }};
+
+    return Promise.all(containers.map(drain));
+}}"""
+
+
+def apply_transforms(fields: dict[str, tuple[Any, ...]], row: list[Any]) -> dict[str, Any]:
+    """Zips one row of raw extractor output back into a dict, running each field's Python transform."""
+    values = {}
+    for (name, spec), value in zip(fields.items(), row):
+        transform = spec[2] if len(spec) > 2 else None
+        values[name] = transform(value) if transform else value
+    return values
@@ -0,0 +1,153 @@
+"""Per-lease Chromium resource metrics read over a CDP session."""
+import math
+import time
+import logging
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, fields
+from typing import Optional, Any, Iterator
+from playwright.async_api import BrowserContext, Page, CDPSession
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+# Performance.getMetrics counters that accumulate over a page's life; reused pages report the lease's delta
+CUMULATIVE = {"LayoutCount": "layout_count", "LayoutDuration": "layout_duration", "RecalcStyleDuration": "recalc_style_duration",
+              "ScriptDuration": "script_duration", "TaskDuration": "task_duration"}
+# Point-in-time gauges read when the lease ends
+GAUGES = {"JSHeapUsedSize": "js_heap_used", "JSHeapTotalSize": "js_heap_total", "Nodes": "dom_nodes", "Documents": "documents"}
+
+_job_metrics: ContextVar[Optional[list["PageMetrics"]]] = ContextVar("job_metrics", default=None)
+
+
+@dataclass
+class PageMetrics:
+    """Resources one page lease cost: durations in seconds, sizes in bytes."""
+    label: str
+    elapsed: float = 0.0
+    failed: bool = False
+    js_heap_used: float = 0.0
+    js_heap_total: float = 0.0
+    dom_nodes: float = 0.0
+    documents: float = 0.0
+    layout_count: float = 0.0
+    layout_duration: float = 0.0
+    recalc_style_duration: float = 0.0
+    script_duration: float = 0.0
+    task_duration: float = 0.0
+    requests: int = 0
+    bytes_received: int = 0
+
+
+METRIC_NAMES = tuple(f.name for f in fields(PageMetrics) if f.name not in ("label", "failed"))
+
+
+@contextmanager
+def job_metrics() -> Iterator[list[PageMetrics]]:
+    """Collects the metrics of every lease made inside the block, including from tasks it spawns."""
+    collected: list[PageMetrics] = []
+    token = _job_metrics.set(collected)
+    try:
+        yield collected
+    finally:
+        _job_metrics.reset(token)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile, ``q`` in 0..100."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+
+async def read_metrics(session: CDPSession) -> dict[str, float]:
+    response = await session.send("Performance.getMetrics")
+    return {metric["name"]: metric["value"] for metric in response["metrics"]}
+
+
+class MetricsProbe:
+    """One lease's CDP session: a baseline of the cumulative counters plus live network byte counting."""
+
+    def __init__(self, session: CDPSession, label: str):
+        self.session = session
+        self.metrics = PageMetrics(label=label)
+        self.baseline: dict[str, float] = {}
+        self.started = time.monotonic()
+
+    def _on_request(self, _):
+        self.metrics.requests += 1
+
+    def _on_loading_finished(self, event: dict[str, Any]):
+        self.metrics.bytes_received += int(event.get("encodedDataLength", 0))
+
+    async def start(self):
+        self.session.on("Network.requestWillBeSent", self._on_request)
+        self.session.on("Network.loadingFinished", self._on_loading_finished)
+        await self.session.send("Performance.enable")
+        await self.session.send("Network.enable")
+        self.baseline = await read_metrics(self.session)
+
+    async def finish(self, failed: bool = False) -> PageMetrics:
+        self.metrics.elapsed = time.monotonic() - self.started
+        self.metrics.failed = failed
+
+        try:
+            current = await read_metrics(self.session)
+            for name, attr in CUMULATIVE.items(): setattr(self.metrics, attr, current.get(name, 0.0) - self.baseline.get(name, 0.0))
+            for name, attr in GAUGES.items(): setattr(self.metrics, attr, current.get(name, 0.0))
+        except Exception as e:
+            logging.debug(f"Failed to read page metrics for {self.metrics.label}: {e}")
+
+        try:
+            await self.session.detach()
+        except Exception as e:
+            logging.debug(f"Failed to detach CDP session: {e}")
+
+        return self.metrics
+
+
+class PageMetricsRecorder:
+    """Opens a CDP session per leased page and aggregates the results per lease label.
+
+    ``PlaywrightBrowser(metrics=PageMetricsRecorder())`` records every lease. Each sample also lands in
+    the list of the enclosing ``job_metrics()`` block, if any, so callers can attach it to a job's result.
+    """
+
+    def __init__(self, history: int = 1000):
+        self.history = history
+        self.samples: dict[str, deque[PageMetrics]] = {}
+
+    async def start(self, context: BrowserContext, page: Page, label: str) -> Optional[MetricsProbe]:
+        """Returns a running probe, or None when the page offers no CDP session (non-Chromium or closed)."""
+        try:
+            probe = MetricsProbe(await context.new_cdp_session(page), label)
+            await probe.start()
+        except Exception as e:
+            logging.debug(f"Page metrics unavailable for {label}: {e}")
+            return None
+        return probe
+
+    def record(self, metrics: PageMetrics):
+        self.samples.setdefault(metrics.label, deque(maxlen=self.history)).append(metrics)
+        collected = _job_metrics.get()
+        if collected is not None: collected.append(metrics)
+
+    def summary(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Per label and metric: sample count, p50, p90, p99 and max."""
+        result = {}
+        for label, samples in self.samples.items():
+            if not samples: continue
+            result[label] = {}
+            for name in METRIC_NAMES:
+                values = [getattr(sample, name) for sample in samples]
+                result[label][name] = {"count": len(values), "p50": percentile(values, 50), "p90": percentile(values, 90),
+                                       "p99": percentile(values, 99), "max": max(values)}
+        return result
+
+    def histogram(self, label: str, metric: str, bounds: list[float]) -> list[tuple[float, int]]:
+        """Counts samples per bucket, each bucket keyed by its inclusive upper bound (``math.inf`` last)."""
+        edges = sorted(bounds) + [math.inf]
+        counts = [0] * len(edges)
+        for sample in self.samples.get(label, ()):
+            value = getattr(sample, metric)
+            counts[next(index for index, edge in enumerate(edges) if value <= edge)] += 1
+        return list(zip(edges, counts))
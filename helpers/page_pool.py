@@ -0,0 +1,145 @@
+"""Bounded pool of reusable Playwright pages with async leasing."""
+import time
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Optional, AsyncIterator
+from playwright.async_api import BrowserContext, Page
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+
+@dataclass
+class LeaseStats:
+    """Timing of a single page lease."""
+    label: str
+    waited: float
+    held: float = 0.0
+    reused: bool = False
+    failed: bool = False
+
+
+@dataclass
+class PoolStats:
+    """Lifetime counters of a PagePool."""
+    created: int = 0
+    reused: int = 0
+    evicted: int = 0
+    discarded: int = 0
+    peak_in_use: int = 0
+
+
+class PagePool:
+    """Leases pages from one context, never holding more than ``max_pages`` open at once.
+
+    Returned pages are kept idle for reuse and closed once unused for ``idle_timeout`` seconds, by a timer
+    running while any page is idle, so a pool that goes quiet still frees its renderers.
+    Pages whose lease raised are closed instead of returned, since their state is unknown.
+    """
+
+    def __init__(self, context: BrowserContext, max_pages: int = 4, idle_timeout: float = 60.0, history: int = 1000):
+        self.context = context
+        self.max_pages = max_pages
+        self.idle_timeout = idle_timeout
+        self.stats = PoolStats()
+        self.leases: deque[LeaseStats] = deque(maxlen=history)
+        self.in_use: set[Page] = set()
+        self._idle: list[tuple[Page, float]] = []
+        self._slots = asyncio.Semaphore(max_pages)
+        self._reaper: Optional[asyncio.Task] = None
+
+    async def acquire(self) -> tuple[Page, bool]:
+        """Waits for a free slot and returns an idle page or a new one, with whether it was reused."""
+        await self._slots.acquire()
+        try:
+            await self.evict_idle()
+            page, reused = None, False
+
+            while self._idle and not page:
+                candidate, _ = self._idle.pop()
+                if not candidate.is_closed(): page, reused = candidate, True
+
+            if not page:
+                page = await self.context.new_page()
+                self.stats.created += 1
+            else:
+                self.stats.reused += 1
+
+        except BaseException:
+            self._slots.release()
+            raise
+
+        self.in_use.add(page)
+        self.stats.peak_in_use = max(self.stats.peak_in_use, len(self.in_use))
+        return page, reused
+
+    async def release(self, page: Page, discard: bool = False):
+        """Returns a leased page to the pool, closing it when discarded."""
+        self.in_use.discard(page)
+        try:
+            if discard or page.is_closed():
+                self.stats.discarded += 1
+                if not page.is_closed(): await page.close()
+            else:
+                self._idle.append((page, time.monotonic()))
+                if self._reaper is None or self._reaper.done(): self._reaper = asyncio.create_task(self._evict_when_idle())
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def lease(self, label: str = "") -> AsyncIterator[Page]:
+        """Leases a page for the duration of the ``async with`` block."""
+        started = time.monotonic()
+        page, reused = await self.acquire()
+        stats = LeaseStats(label=label, waited=time.monotonic() - started, reused=reused)
+        leased = time.monotonic()
+
+        try:
+            yield page
+        except BaseException:
+            stats.failed = True
+            raise
+        finally:
+            stats.held = time.monotonic() - leased
+            self.leases.append(stats)
+            await self.release(page, discard=stats.failed)
+
+    async def evict_idle(self, now: Optional[float] = None):
+        """Closes idle pages unused for longer than idle_timeout."""
+        now = now if now is not None else time.monotonic()
+        # Taken off the idle list before any await, so a concurrent acquire never leases a page being closed
+        expired = [page for page, last_used in self._idle if now - last_used >= self.idle_timeout]
+        self._idle = [(page, last_used) for page, last_used in self._idle if now - last_used < self.idle_timeout]
+
+        for page in expired:
+            self.stats.evicted += 1
+            try:
+                if not page.is_closed(): await page.close()
+            except Exception as e:
+                logging.debug(f"Failed to close idle page: {e}")
+
+    async def _evict_when_idle(self):
+        """Sleeps until the oldest idle page expires and evicts it, until no page is left idle."""
+        while self._idle:
+            oldest = min(last_used for _, last_used in self._idle)
+            await asyncio.sleep(max(oldest + self.idle_timeout - time.monotonic(), 0))
+            await self.evict_idle()
+
+    async def close(self):
+        """Closes every idle and leased page."""
+        if self._reaper:
+            self._reaper.cancel()
+            await asyncio.gather(self._reaper, return_exceptions=True)
+            self._reaper = None
+
+        pages = [page for page, _ in self._idle] + list(self.in_use)
+        self._idle.clear()
+        self.in_use.clear()
+
+        for page in pages:
+            try:
+                if not page.is_closed(): await page.close()
+            except Exception as e:
+                logging.debug(f"Failed to close page: {e}")
@@ -1,31 +1,144 @@
+import time
 import random
+import asyncio
 import logging
-from typing import Optional, Any
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Optional, Any, Union, AsyncIterator
+from playwright.async_api import Browser, BrowserContext, Page
+from backend.workers.parser.helpers.js_extractor import compile_extractor, field_spec
+from backend.workers.parser.helpers.route_policy import RoutePolicy
+from backend.workers.parser.helpers.page_pool import PagePool
+from backend.workers.parser.helpers.browser_manager import BrowserManager
+from backend.workers.parser.helpers.launch_profiles import LaunchProfile
+from backend.workers.parser.helpers.html_snapshot import HtmlSnapshot
+from backend.workers.parser.helpers.http_fetcher import SessionState
+from backend.workers.parser.helpers.asset_cache import AssetCache
+from backend.workers.parser.helpers.recycle_policy import RecyclePolicy, HEAP_JS, descendant_rss
+from backend.workers.parser.helpers.page_metrics import PageMetricsRecorder
+from backend.workers.parser.helpers.har_archive import HarArchive
+from backend.workers.parser.helpers.protocol_trace import ProtocolTrace, Traced
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+AUTO_SCROLL_JS = """
+async ({step, delay, maxScrolls, stableRounds, deadline, rowSelector}) => {
+    const started = performance.now();
+    const root = document.scrollingElement || document.documentElement;
+    const size = () => rowSelector ? document.querySelectorAll(rowSelector).length : root.scrollHeight;
+    let last = size(), stable = 0, scrolls = 0, reason = 'max_scrolls', wake = null;
+
+    // Only growth cuts a pause short: unrelated mutations (ads, timers) must not count as quiet rounds
+    const observer = new MutationObserver(() => { if (wake && size() > last) wake(); });
+    observer.observe(document.body, {childList: true, subtree: true});
+    const pause = () => new Promise((resolve) => { wake = resolve; setTimeout(resolve, delay); });
+
+    try {
+        while (scrolls < maxScrolls) {
+            if (performance.now() - started >= deadline) { reason = 'deadline'; break; }
+            window.scrollBy(0, step);
+            scrolls++;
+            await pause();
+            wake = null;
+
+            const current = size();
+            if (current > last) { last = current; stable = 0; continue; }
+            const atBottom = window.innerHeight + window.scrollY >= root.scrollHeight - 2;
+            if (atBottom && ++stable >= stableRounds) { reason = 'stable'; break; }
+        }
+    } finally {
+        observer.disconnect();
+    }
+    return {scrolls, elapsed: (performance.now() - started) / 1000, reason, size: last};
+}
+"""
+
+
+@dataclass
+class ScrollResult:
+    """Outcome of auto_scroll: wheel steps taken, seconds spent and why it stopped."""
+    scrolls: int
+    elapsed: float
+    reason: str
+    size: Optional[int] = None
+
+
+@dataclass
+class ExtractionStats:
+    """Protocol round trips spent on extraction and round trips avoided by bulk calls."""
+    round_trips: int = 0
+    round_trips_saved: int = 0
 
 
 class PlaywrightBrowser:
-    def __init__(self):
-        self.playwright = None
+    def __init__(self, route_policy: Optional[RoutePolicy] = None, max_pages: int = 4, idle_timeout: float = 60.0, manager: Optional[BrowserManager] = None,
+                 profile: Union[str, LaunchProfile] = "headless-shell", user_data_dir: Optional[str] = None, asset_cache: Optional[AssetCache] = None,
+                 recycle_policy: Optional[RecyclePolicy] = None, metrics: Optional[PageMetricsRecorder] = None, har: Optional[HarArchive] = None,
+                 trace: Optional[ProtocolTrace] = None):
+        self.route_policy = route_policy
+        self.trace = trace
+        self.har = har
+        self.recycle_policy = recycle_policy
+        self.metrics = metrics
+        self.user_data_dir = user_data_dir
+        self.asset_cache = asset_cache
+        self.max_pages = max_pages
+        self.idle_timeout = idle_timeout
+        self.manager = manager or BrowserManager(profile=profile)
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self.pool: Optional[PagePool] = None
+        self.stats = ExtractionStats()
+        self._attached = False
+        self._reconnect_lock = asyncio.Lock()
+        self._rotate_lock = asyncio.Lock()
+        self._context_pages = 0
+        self._context_started = 0.0
+        self._draining: set[asyncio.Task] = set()
 
     async def setup(self):
-        """Initialize browser with anti-detection settings."""
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(
-            headless=False,
-            args=["--disable-blink-features=AutomationControlled"]
-        )
-        self.context = await self.browser.new_context(
-            viewport={"width": 1366, "height": 768},
+        """Attach to the manager's browser and open an isolated context for this instance.
+
+        With ``user_data_dir`` the context is persistent instead, on a browser of its own. It keeps cookies
+        and storage but not cached responses: the routes attached below disable Chromium's HTTP cache, so
+        ``asset_cache`` is the only cache in effect.
+        """
+        if self.user_data_dir:
+            self.context = await self.manager.acquire_persistent(self.user_data_dir, **self._context_options())
+            self.browser = self.context.browser
+            self._attached = True
+            await self._attach_routes(self.context)
+        else:
+            self.browser = await self.manager.acquire()
+            self._attached = True
+            self.context = await self._new_context()
+
+        self.pool = PagePool(self.context, max_pages=self.max_pages, idle_timeout=self.idle_timeout)
+        self._context_pages, self._context_started = 0, time.monotonic()
+
+    def _context_options(self) -> dict[str, Any]:
+        return dict(
+            **self.manager.profile.context_options(),
             user_agent=self._get_random_user_agent(),
             locale='en-US'
         )
 
+    async def _new_context(self) -> BrowserContext:
+        context = await self.browser.new_context(**self._context_options())
+        try:
+            await self._attach_routes(context)
+        except BaseException:
+            await self._close_context(context)
+            raise
+        return context
+
+    async def _attach_routes(self, context: BrowserContext):
+        # Routes run last-registered first: the policy decides before the cache or a HAR replay serves anything.
+        # Any route disables Chromium's HTTP cache for the context, which is why static assets go through AssetCache
+        if self.har: await self.har.attach(context)
+        if self.asset_cache: await self.asset_cache.attach(context, fetch_misses=not (self.har and self.har.mode == "replay"))
+        if self.route_policy: await self.route_policy.attach(context)
+
     def _get_random_user_agent(self) -> str:
         """Generate random user agent from predefined list."""
         user_agents = [
@@ -36,20 +149,162 @@ class PlaywrightBrowser:
 
     async def close(self):
         """Cleanup resources."""
-        if self.page: await self.page.close()
-        if self.context: await self.context.close()
-        if self.browser: await self.browser.close()
-        if self.playwright: await self.playwright.stop()
+        for task in list(self._draining): task.cancel()
+        if self._draining: await asyncio.gather(*self._draining, return_exceptions=True)
+        if self.pool: await self.pool.close()
+        if self.page and not self.page.is_closed(): await self.page.close()
+        if self.context:
+            try:
+                await self.context.close()
+            except Exception as e:
+                logging.debug(f"Failed to close context: {e}")
+        if self._attached: await self.manager.release()
+        self.pool, self.page, self.context, self.browser = None, None, None, None
+        self._attached = False
+
+    async def reconnect(self):
+        """Reopens this instance's context after the browser connection dropped; concurrent callers share one reconnect."""
+        async with self._reconnect_lock:
+            if self.browser and self.browser.is_connected(): return
+            logging.info("Browser connection lost, reopening context")
+            await self.close()
+            await self.setup()
 
     async def new_page(self) -> Page:
         """Open a new browser page in the current context."""
         self.page = await self.context.new_page()
         return self.page
 
+    @asynccontextmanager
+    async def lease_page(self, label: str = "") -> AsyncIterator[Page]:
+        """Leases a pooled page: ``async with browser.lease_page("parse_x") as page``.
+
+        With a ``metrics`` recorder the lease is measured over its own CDP session, recorded under ``label``.
+        With a ``trace`` the page is yielded behind a proxy counting and timing every protocol call on it.
+        """
+        if self.browser and not self.browser.is_connected(): await self.reconnect()
+        pool = self.pool
+
+        async with pool.lease(label) as page:
+            probe = await self.metrics.start(pool.context, page, label) if self.metrics else None
+            failed, heap_mb = True, None
+            try:
+                yield Traced(page, self.trace) if self.trace else page
+                failed = False
+                if self.recycle_policy and pool is self.pool: heap_mb = await self._sample_heap(page)
+            finally:
+                if probe: self.metrics.record(await probe.finish(failed=failed))
+
+        if self.recycle_policy and pool is self.pool: await self._maybe_recycle(heap_mb)
+
+    async def _sample_heap(self, page: Page) -> Optional[float]:
+        """JS heap of the leased page in MiB when this lease is due for a sample, else None."""
+        policy = self.recycle_policy
+        if not policy.max_js_heap_mb or not policy.should_sample(self._context_pages + 1): return None
+        try:
+            heap = await page.evaluate(HEAP_JS)
+        except Exception as e:
+            logging.debug(f"Failed to sample JS heap: {e}")
+            return None
+        if not heap: return None
+        policy.stats.last_heap_mb = heap / 2 ** 20
+        return policy.stats.last_heap_mb
+
+    async def _maybe_recycle(self, heap_mb: Optional[float]):
+        """Counts the returned lease and rotates the context when the policy asks for it; ``heap_mb`` is this lease's sample."""
+        policy = self.recycle_policy
+        self._context_pages += 1
+
+        rss_mb = None
+        if policy.max_rss_mb and policy.should_sample(self._context_pages):
+            rss = await asyncio.to_thread(descendant_rss)
+            if rss: rss_mb = policy.stats.last_rss_mb = rss / 2 ** 20
+
+        reason = policy.reason(self._context_pages, time.monotonic() - self._context_started, heap_mb, rss_mb)
+        if reason: await self.rotate(reason)
+
+    async def rotate(self, reason: str = "manual") -> bool:
+        """Swaps in a fresh context carrying the old cookies, warmed with one open page, and drains the old one in the background.
+
+        Leases already running finish on the old context, which closes once they are all returned (or after
+        the policy's drain timeout). Persistent contexts cannot be duplicated and are never rotated.
+        Rotation runs on the way out of a lease, so a replacement that fails to come up is closed and logged
+        and the current context kept, rather than failing the lease. Returns whether the context was swapped.
+        """
+        if self.user_data_dir or self._rotate_lock.locked(): return False
+
+        async with self._rotate_lock:
+            started = time.monotonic()
+            context, pool = None, None
+            try:
+                context = await self._new_context()
+                await context.add_cookies(await self.context.cookies())
+                pool = PagePool(context, max_pages=self.max_pages, idle_timeout=self.idle_timeout)
+                async with pool.lease("warmup") as page:
+                    await page.goto("about:blank")
+            except Exception as e:
+                logging.warning(f"Context rotation ({reason}) failed, keeping the current context: {e}")
+                if self.recycle_policy: self.recycle_policy.stats.failures += 1
+                if pool: await pool.close()
+                if context: await self._close_context(context)
+                return False
+
+            old_context, old_pool = self.context, self.pool
+            self.context, self.pool = context, pool
+            pages, self._context_pages, self._context_started = self._context_pages, 0, time.monotonic()
+
+            drain_timeout = self.recycle_policy.drain_timeout if self.recycle_policy else 60.0
+            task = asyncio.create_task(self._drain(old_pool, old_context, drain_timeout))
+            self._draining.add(task)
+            task.add_done_callback(self._draining.discard)
+
+            warmup = time.monotonic() - started
+            if self.recycle_policy: self.recycle_policy.record(reason, warmup)
+            logging.info(f"Rotated browser context ({reason}) after {pages} pages, replacement ready in {warmup:.2f}s")
+            return True
+
+    @staticmethod
+    async def _drain(pool: PagePool, context: BrowserContext, timeout: float):
+        deadline = time.monotonic() + timeout
+        try:
+            while pool.in_use and time.monotonic() < deadline: await asyncio.sleep(0.1)
+            if pool.in_use: logging.warning(f"Closing old context with {len(pool.in_use)} pages still leased")
+        finally:
+            await pool.close()
+            await PlaywrightBrowser._close_context(context)
+
+    @staticmethod
+    async def _close_context(context: BrowserContext):
+        try:
+            await context.close()
+        except Exception as e:
+            logging.debug(f"Failed to close context: {e}")
+
+    async def export_session(self) -> SessionState:
+        """Exports this context's cookies and identifying headers for reuse by an HTTP client."""
+        async with self.lease_page("export_session") as page:
+            user_agent, language = await page.evaluate("() => [navigator.userAgent, navigator.languages.join(',')]")
+
+        return SessionState(cookies=await self.context.cookies(), headers={"User-Agent": user_agent, "Accept-Language": language})
+
+    async def harvest_session(self, url: str) -> SessionState:
+        """Loads a page in the browser (passing consent, cookies or JS challenges) and exports the resulting session."""
+        async with self.lease_page("harvest_session") as page:
+            await page.goto(url, wait_until="load", timeout=30000)
+
+        return await self.export_session()
+
+    async def snapshot(self, page: Optional[Page] = None) -> HtmlSnapshot:
+        """Captures the page HTML once so extraction can continue offline; pass the result as ``parent``."""
+        self.stats.round_trips += 1
+        return await HtmlSnapshot.capture(page or self.page)
+
     async def extract_text(self, selector: str, parent: Optional[Any] = None) -> Optional[str]:
         """Safe text extraction from selector."""
         try:
+            if isinstance(parent, HtmlSnapshot): return parent.text(selector)
             element = await parent.query_selector(selector) if parent else await self.page.query_selector(selector)
+            self.stats.round_trips += 2 if element else 1
             return (await element.text_content()).strip() if element else None
         except Exception as e:
             logging.error(f"Error extracting text: {e}")
@@ -67,8 +322,59 @@ class PlaywrightBrowser:
             logging.error(f"Error extracting number: {e}")
             return None
 
-    async def auto_scroll(self, delay: float = 0.1, step: int = 300, max_scrolls: int = 50):
-        """Scrolls page down to force loading of all dynamic content."""
+    async def extract_rows(self, row_selector: str, fields: dict[str, tuple[Optional[str], str]], parent: Optional[Any] = None) -> list[dict[str, Any]]:
+        """Extracts every row's fields in a single in-page call.
+
+        ``fields`` maps a result key to ``(selector, value_type)`` where value_type is "text" or "number",
+        with the same semantics as extract_text / extract_number applied relative to each row.
+        """
+        spec = field_spec(fields)
+        if isinstance(parent, HtmlSnapshot): return [dict(zip(fields, values)) for values in parent.extract(row_selector, spec)]
+
+        try:
+            target = parent if parent else self.page
+            raw = await target.eval_on_selector_all(row_selector, compile_extractor(spec))
+        except Exception as e:
+            logging.error(f"Error extracting rows: {e}")
+            return []
+
+        rows = [dict(zip(fields, values)) for values in raw]
+        self.record_bulk(len(rows), spec)
+
+        return rows
+
+    def record_bulk(self, row_count: int, spec: tuple) -> None:
+        """Records one bulk extraction against the per-field cost it replaced."""
+        # The per-field path costs a query_selector plus a text_content for every field of every row
+        per_field = 2 * row_count * sum(1 for _, selector, _ in spec if selector)
+        self.stats.round_trips += 1
+        self.stats.round_trips_saved += max(per_field - 1, 0)
+        logging.debug(f"Extracted {row_count} rows in 1 round trip ({per_field} with per-field extraction)")
+
+    async def auto_scroll(self, delay: float = 0.1, step: int = 300, max_scrolls: int = 50, page: Optional[Page] = None,
+                          until_stable: bool = False, row_selector: Optional[str] = None, stable_rounds: int = 5, deadline: float = 15.0) -> ScrollResult:
+        """Scrolls page down to force loading of all dynamic content.
+
+        With ``until_stable`` the scroll loop runs in-page and returns once the page is at the bottom and
+        its scrollHeight (or the count of ``row_selector`` matches) has not grown for ``stable_rounds`` pauses.
+        A DOM mutation ends a pause early, and ``deadline`` seconds bounds the whole scroll.
+        """
+        page = page or self.page
+
+        if until_stable:
+            result = await page.evaluate(AUTO_SCROLL_JS, {
+                "step": step, "delay": delay * 1000, "maxScrolls": max_scrolls,
+                "stableRounds": stable_rounds, "deadline": deadline * 1000, "rowSelector": row_selector
+            })
+            self.stats.round_trips += 1
+            scroll = ScrollResult(**result)
+            logging.debug(f"Auto-scroll stopped ({scroll.reason}) after {scroll.scrolls} scrolls in {scroll.elapsed:.2f}s")
+            return scroll
+
+        started = time.monotonic()
         for _ in range(max_scrolls):
-            await self.page.mouse.wheel(0, step)
-            await self.page.wait_for_timeout(int(delay * 100))
+            await page.mouse.wheel(0, step)
+            await page.wait_for_timeout(int(delay * 1000))
+        self.stats.round_trips += 2 * max_scrolls
+
+        return ScrollResult(scrolls=max_scrolls, elapsed=time.monotonic() - started, reason="max_scrolls")
@@ -0,0 +1,152 @@
+"""Counts and times every Playwright protocol call by selector and calling parser method."""
+import os
+import sys
+import time
+import inspect
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional, Any, Iterator
+from playwright.async_api import ElementHandle
+
+# Methods whose first argument (or ``selector`` keyword) is a selector
+SELECTOR_METHODS = frozenset({
+    "query_selector", "query_selector_all", "wait_for_selector", "eval_on_selector", "eval_on_selector_all",
+    "click", "dblclick", "hover", "fill", "type", "press", "check", "uncheck", "select_option", "focus",
+    "text_content", "inner_text", "inner_html", "get_attribute", "is_visible", "is_hidden", "is_enabled",
+})
+# Sub-objects of a page whose methods are protocol calls too
+TRACED_ATTRIBUTES = frozenset({"mouse", "keyboard"})
+
+MODELS_DIR = os.sep + "models" + os.sep
+
+_job_trace: ContextVar[Optional["ProtocolTrace"]] = ContextVar("job_trace", default=None)
+
+
+@dataclass
+class CallStats:
+    """Count and timing of one (caller, method, selector) combination."""
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+def find_caller() -> str:
+    """Names the parser method behind the current call, else the nearest function outside this module."""
+    frame, fallback = sys._getframe(2), None
+
+    for _ in range(40):
+        if frame is None: break
+        filename = frame.f_code.co_filename
+        if MODELS_DIR in filename: return frame.f_code.co_qualname
+        if fallback is None and filename != __file__ and "asyncio" not in filename: fallback = frame.f_code.co_qualname
+        frame = frame.f_back
+
+    return fallback or "?"
+
+
+def selector_of(method: str, args: tuple, kwargs: dict[str, Any]) -> Optional[str]:
+    if method not in SELECTOR_METHODS: return None
+    if "selector" in kwargs: return kwargs["selector"]
+    return args[0] if args and isinstance(args[0], str) else None
+
+
+@contextmanager
+def job_trace() -> Iterator["ProtocolTrace"]:
+    """Collects every traced call made inside the block, including from tasks it spawns."""
+    trace = ProtocolTrace()
+    token = _job_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _job_trace.reset(token)
+
+
+class ProtocolTrace:
+    """Aggregated protocol calls keyed by ``(caller, method, selector)``."""
+
+    def __init__(self):
+        self.calls: dict[tuple[str, str, str], CallStats] = {}
+
+    def record(self, caller: str, method: str, selector: str, elapsed: float):
+        stats = self.calls.setdefault((caller, method, selector), CallStats())
+        stats.count += 1
+        stats.total += elapsed
+        stats.max = max(stats.max, elapsed)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(stats.count for stats in self.calls.values())
+
+    def by_caller(self) -> dict[str, CallStats]:
+        """Calls and time per calling method, most expensive first."""
+        callers: dict[str, CallStats] = {}
+        for (caller, _, _), stats in self.calls.items():
+            merged = callers.setdefault(caller, CallStats())
+            merged.count += stats.count
+            merged.total += stats.total
+            merged.max = max(merged.max, stats.max)
+        return dict(sorted(callers.items(), key=lambda item: item[1].total, reverse=True))
+
+    def slowest(self, n: int = 10) -> list[tuple[tuple[str, str, str], CallStats]]:
+        """The ``n`` selectors (with their method and caller) that took the most time in total."""
+        selected = [(key, stats) for key, stats in self.calls.items() if key[2]]
+        return sorted(selected, key=lambda item: item[1].total, reverse=True)[:n]
+
+    def report(self, n: int = 10) -> str:
+        lines = [f"{'caller':<48}{'calls':>7}{'total s':>10}"]
+        for caller, stats in self.by_caller().items(): lines.append(f"{caller:<48}{stats.count:>7}{stats.total:>10.3f}")
+
+        lines += ["", f"Top {n} selectors by total time", f"{'calls':>7}{'total s':>10}{'mean ms':>10}{'max ms':>9}  method / caller / selector"]
+        for (caller, method, selector), stats in self.slowest(n):
+            lines.append(f"{stats.count:>7}{stats.total:>10.3f}{1000 * stats.mean:>10.2f}{1000 * stats.max:>9.1f}  {method} / {caller} / {selector}")
+        return "\n".join(lines)
+
+
+class Traced:
+    """Proxy for a Page, ElementHandle, Mouse or Keyboard that records each coroutine method call.
+
+    Element handles it returns are traced too, remembering the selector that found them, so a later
+    ``element.text_content()`` is charged to that selector. Everything else passes straight through.
+    """
+
+    __slots__ = ("_target", "_trace", "_origin")
+
+    def __init__(self, target: Any, trace: ProtocolTrace, origin: str = ""):
+        self._target = target
+        self._trace = trace
+        self._origin = origin
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if name in TRACED_ATTRIBUTES: return Traced(attr, self._trace, self._origin)
+        if not inspect.iscoroutinefunction(attr): return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            selector = selector_of(name, args, kwargs) or self._origin
+            caller = find_caller()
+            started = time.perf_counter()
+            try:
+                result = await attr(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                self._trace.record(caller, name, selector, elapsed)
+                job = _job_trace.get()
+                if job is not None and job is not self._trace: job.record(caller, name, selector, elapsed)
+            return self._wrap(result, selector)
+
+        return call
+
+    def _wrap(self, result: Any, selector: str) -> Any:
+        if isinstance(result, ElementHandle): return Traced(result, self._trace, selector)
+        if isinstance(result, list) and result and isinstance(result[0], ElementHandle): return [Traced(item, self._trace, selector) for item in result]
+        return result
+
+    def __repr__(self) -> str:
+        return f"Traced({self._target!r})"
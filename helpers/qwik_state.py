@@ -0,0 +1,71 @@
+"""Decoder for the state Qwik serializes into server-rendered pages."""
+import json
+import logging
+from typing import Optional, Any, Iterator
+from bs4 import BeautifulSoup
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+# Id suffixes Qwik appends to object references (signals, promises, derived values)
+REF_SUFFIXES = "!~#^*"
+# Strings starting with a control character encode special values (undefined, QRLs, tasks, JSX...)
+SPECIAL_PREFIX = " "
+
+
+def extract_qwik_state(html: str) -> Optional[dict[str, Any]]:
+    """Returns the parsed ``<script type="qwik/json">`` payload of a page, or None when absent."""
+    script = BeautifulSoup(html, "lxml").find("script", attrs={"type": "qwik/json"})
+    if not script or not script.string: return None
+
+    try:
+        return json.loads(script.string)
+    except json.JSONDecodeError as e:
+        logging.warning(f"Malformed qwik/json payload: {e}")
+        return None
+
+
+class QwikStateDecoder:
+    """Resolves the flat ``objs`` table of a Qwik state payload into nested Python values.
+
+    Containers in ``objs`` reference their members by base-36 index strings; scalars are stored
+    inline. Special values (functions, JSX, undefined) decode to None.
+    """
+
+    def __init__(self, state: dict[str, Any]):
+        self.objs: list[Any] = state.get("objs") or []
+        self._resolved: dict[int, Any] = {}
+
+    def ref(self, value: Any) -> Any:
+        """Resolves one container member, which is an object reference when it is a string."""
+        if not isinstance(value, str): return value
+
+        key = value.rstrip(REF_SUFFIXES)
+        try:
+            index = int(key, 36)
+        except ValueError:
+            return None
+
+        return self.resolve(index) if 0 <= index < len(self.objs) else None
+
+    def resolve(self, index: int) -> Any:
+        if index in self._resolved: return self._resolved[index]
+
+        raw = self.objs[index]
+
+        if isinstance(raw, dict):
+            value = self._resolved[index] = {}
+            for key, member in raw.items(): value[key] = self.ref(member)
+        elif isinstance(raw, list):
+            value = self._resolved[index] = []
+            value.extend(self.ref(member) for member in raw)
+        elif isinstance(raw, str) and raw and raw[0] < SPECIAL_PREFIX:
+            value = self._resolved[index] = None
+        else:
+            value = self._resolved[index] = raw
+
+        return value
+
+    def roots(self) -> Iterator[Any]:
+        """Yields every decoded container in the payload."""
+        for index, raw in enumerate(self.objs):
+            if isinstance(raw, (dict, list)): yield self.resolve(index)
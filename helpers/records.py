@@ -0,0 +1,48 @@
+"""Schema mapping helpers for JSON-like payloads (embedded page state, API responses)."""
+from typing import Optional, Any, Iterable, Iterator
+
+
+def iter_containers(payload: Any) -> Iterator[Any]:
+    """Yields every dict and list nested in a payload, outermost first, visiting each object once."""
+    stack, seen = [payload], set()
+
+    while stack:
+        value = stack.pop()
+        if not isinstance(value, (dict, list)) or id(value) in seen: continue
+        seen.add(id(value))
+        yield value
+        stack.extend(reversed(list(value.values() if isinstance(value, dict) else value)))
+
+
+def map_record(record: dict[str, Any], aliases: dict[str, tuple[str, ...]]) -> dict[str, Any]:
+    """Maps a record onto schema field names using per-field candidate keys."""
+    values = {}
+    for field_name, keys in aliases.items():
+        for key in keys:
+            if key in record and record[key] is not None:
+                values[field_name] = record[key]
+                break
+    return values
+
+
+def find_records(roots: Iterable[Any], aliases: dict[str, tuple[str, ...]], min_fields: int, required: tuple[str, ...] = ()) -> list[dict[str, Any]]:
+    """Finds the largest list of records carrying at least ``min_fields`` of the aliased fields, ``required`` among them."""
+    best: list[dict[str, Any]] = []
+
+    for root in roots:
+        if not isinstance(root, list) or len(root) <= len(best): continue
+
+        records = [map_record(item, aliases) for item in root if isinstance(item, dict)]
+        records = [record for record in records if len(record) >= min_fields and all(name in record for name in required)]
+        if len(records) > len(best) and len(records) * 2 >= len(root): best = records
+
+    return best
+
+
+def find_keyed(roots: Iterable[Any], keys: tuple[str, ...]) -> Optional[Any]:
+    """Returns the first non-null value stored under exactly one of ``keys``."""
+    for root in roots:
+        if not isinstance(root, dict): continue
+        for key in keys:
+            if root.get(key) is not None: return root[key]
+    return None
@@ -0,0 +1,90 @@
+"""When to replace a long-lived browser context before its memory grows unbounded."""
+import os
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+HEAP_JS = "() => performance.memory ? performance.memory.usedJSHeapSize : null"
+
+
+def descendant_rss(pid: Optional[int] = None) -> Optional[int]:
+    """Resident bytes of every descendant of ``pid`` (the Playwright driver and the Chromium it launched).
+
+    Reads /proc, so it returns None on platforms without it.
+    """
+    pid = pid or os.getpid()
+    try:
+        entries = [entry for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return None
+
+    children: dict[int, list[int]] = {}
+    rss: dict[int, int] = {}
+    page_size = os.sysconf("SC_PAGE_SIZE")
+
+    for entry in entries:
+        try:
+            with open(f"/proc/{entry}/stat") as f: stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so fields are counted from its closing parenthesis
+        fields = stat[stat.rfind(")") + 2:].split()
+        children.setdefault(int(fields[1]), []).append(int(entry))
+        rss[int(entry)] = int(fields[21]) * page_size
+
+    total, stack = 0, list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        total += rss.get(child, 0)
+        stack.extend(children.get(child, []))
+
+    return total
+
+
+@dataclass
+class RecycleStats:
+    """Context rotations by reason, failed rotation attempts, and the time spent opening and warming replacements."""
+    rotations: int = 0
+    failures: int = 0
+    reasons: Counter = field(default_factory=Counter)
+    warmup_seconds: float = 0.0
+    last_heap_mb: Optional[float] = None
+    last_rss_mb: Optional[float] = None
+
+
+@dataclass
+class RecyclePolicy:
+    """Limits after which PlaywrightBrowser swaps its context for a fresh one.
+
+    ``max_pages`` counts leases on the current context and ``max_age`` its seconds alive. The memory
+    limits are sampled every ``sample_every`` leases: ``max_js_heap_mb`` against the used JS heap of the
+    page just released, ``max_rss_mb`` against the driver and browser processes (locally launched only).
+    """
+    max_pages: Optional[int] = 500
+    max_age: Optional[float] = 3600.0
+    max_js_heap_mb: Optional[float] = None
+    max_rss_mb: Optional[float] = None
+    sample_every: int = 20
+    drain_timeout: float = 60.0
+    stats: RecycleStats = field(default_factory=RecycleStats)
+
+    def should_sample(self, pages: int) -> bool:
+        return pages % self.sample_every == 0
+
+    def reason(self, pages: int, age: float, heap_mb: Optional[float] = None, rss_mb: Optional[float] = None) -> Optional[str]:
+        """Returns why the context is due for rotation, or None while it is within every limit."""
+        if self.max_pages and pages >= self.max_pages: return "pages"
+        if self.max_age and age >= self.max_age: return "age"
+        if self.max_js_heap_mb and heap_mb and heap_mb >= self.max_js_heap_mb: return "js_heap"
+        if self.max_rss_mb and rss_mb and rss_mb >= self.max_rss_mb: return "rss"
+        return None
+
+    def record(self, reason: str, warmup: float):
+        self.stats.rotations += 1
+        self.stats.reasons[reason] += 1
+        self.stats.warmup_seconds += warmup
+        # The last heap sample was taken on the retired context and says nothing about the fresh one
+        self.stats.last_heap_mb = None
@@ -0,0 +1,54 @@
+"""Capture of JSON API responses a page fetches while it renders."""
+import asyncio
+import logging
+from fnmatch import fnmatch
+from typing import Any
+from playwright.async_api import Page, Response
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+
+class ResponseCapture:
+    """Subscribes to ``page.on("response")`` and keeps the JSON body of the first response per named URL glob.
+
+    Attach before navigating so no response is missed, then ``await capture.wait()`` to resolve as soon as
+    every pattern has matched:
+
+        async with ResponseCapture(page, {"profile": "*/summoner/summoner*"}) as capture:
+            await page.goto(url, wait_until="commit")
+            payloads = await capture.wait(timeout=10)
+    """
+
+    def __init__(self, page: Page, patterns: dict[str, str]):
+        self.page = page
+        self.patterns = patterns
+        self.payloads: dict[str, Any] = {}
+        self._done = asyncio.Event()
+
+    async def _on_response(self, response: Response):
+        for name, pattern in self.patterns.items():
+            if name in self.payloads or not fnmatch(response.url, pattern): continue
+            if not response.ok: continue
+
+            try:
+                self.payloads[name] = await response.json()
+            except Exception as e:
+                logging.debug(f"Ignoring non-JSON response for {name} at {response.url}: {e}")
+                continue
+
+            if len(self.payloads) == len(self.patterns): self._done.set()
+
+    async def wait(self, timeout: float = 10.0) -> dict[str, Any]:
+        """Waits until every pattern matched or the timeout elapsed, returning what was captured."""
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout)
+        except asyncio.TimeoutError:
+            logging.info(f"Captured {len(self.payloads)}/{len(self.patterns)} responses before timeout: {sorted(self.payloads)}")
+        return self.payloads
+
+    async def __aenter__(self) -> "ResponseCapture":
+        self.page.on("response", self._on_response)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.page.remove_listener("response", self._on_response)
@@ -0,0 +1,79 @@
+"""Request interception policy for Playwright contexts and pages."""
+import logging
+from fnmatch import fnmatch
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Union
+from playwright.async_api import BrowserContext, Page, Route, Response
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+DEFAULT_BLOCKED_TYPES = frozenset({"image", "font", "media"})
+
+TRACKER_PATTERNS = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*googlesyndication.com*",
+    "*doubleclick.net*",
+    "*adservice.google.*",
+    "*fundingchoicesmessages.google.com*",
+    "*amazon-adsystem.com*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*clarity.ms*",
+    "*nitropay.com*",
+    "*playwire.com*",
+)
+
+
+@dataclass
+class RouteStats:
+    """Counters for requests seen by a RoutePolicy."""
+    allowed: int = 0
+    blocked: int = 0
+    blocked_by_type: Counter = field(default_factory=Counter)
+    bytes_received: int = 0
+
+
+@dataclass
+class RoutePolicy:
+    """Allow/deny rules by resource type and URL glob, applied through context.route or page.route.
+
+    Allow patterns take precedence over every deny rule, so a parser can keep a single
+    image or script it depends on while blocking the rest of its type.
+    """
+    block_resource_types: frozenset[str] = DEFAULT_BLOCKED_TYPES
+    block_url_patterns: tuple[str, ...] = TRACKER_PATTERNS
+    allow_url_patterns: tuple[str, ...] = ()
+    stats: RouteStats = field(default_factory=RouteStats)
+
+    def allows(self, url: str, resource_type: str) -> bool:
+        """Decides whether a request may go through."""
+        if any(fnmatch(url, pattern) for pattern in self.allow_url_patterns): return True
+        if resource_type in self.block_resource_types: return False
+        return not any(fnmatch(url, pattern) for pattern in self.block_url_patterns)
+
+    async def handle(self, route: Route):
+        """Route handler aborting denied requests and passing the rest on."""
+        request = route.request
+
+        if self.allows(request.url, request.resource_type):
+            self.stats.allowed += 1
+            await route.fallback()
+        else:
+            self.stats.blocked += 1
+            self.stats.blocked_by_type[request.resource_type] += 1
+            await route.abort("blockedbyclient")
+
+    def on_response(self, response: Response):
+        """Accumulates transferred bytes from the Content-Length of allowed responses."""
+        try:
+            self.stats.bytes_received += int(response.headers.get("content-length", 0))
+        except ValueError:
+            pass
+
+    async def attach(self, target: Union[BrowserContext, Page]):
+        """Installs the policy on a context or a single page."""
+        await target.route("**/*", self.handle)
+        target.on("response", self.on_response)
+        logging.debug(f"Route policy attached, blocking types {sorted(self.block_resource_types)}")
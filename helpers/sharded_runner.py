@@ -0,0 +1,151 @@
+"""Runs parser jobs across several worker processes, each with its own browser."""
+import os
+import time
+import queue
+import asyncio
+import logging
+import multiprocessing
+from dataclasses import dataclass, field
+from typing import Optional, Any, Iterable
+from backend.workers.parser.helpers.page_metrics import PageMetrics, job_metrics
+from backend.workers.parser.helpers.protocol_trace import ProtocolTrace, job_trace
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+
+@dataclass
+class Job:
+    """One parser call: ``getattr(parser, method)(**kwargs)`` on the named parser."""
+    parser: str
+    method: str
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class JobResult:
+    """A job's return value or error, with the worker that ran it, how long it took, its page metrics and protocol calls."""
+    index: int
+    value: Any = None
+    error: Optional[str] = None
+    worker: Optional[int] = None
+    elapsed: float = 0.0
+    metrics: list[PageMetrics] = field(default_factory=list)
+    trace: Optional[ProtocolTrace] = None
+
+
+def create_parser(name: str, manager, options: dict[str, Any]):
+    """Instantiates a parser by name inside a worker process, sharing the worker's BrowserManager."""
+    if name == "lolalytics":
+        from backend.workers.parser.models.lolalytics_parser import LolalyticsParser
+        return LolalyticsParser(browser_manager=manager, **options)
+    if name == "deeplol":
+        from backend.workers.parser.models.deeplol_parser import DeepLOLParser
+        return DeepLOLParser(browser_manager=manager, **options)
+    raise ValueError(f"Unknown parser: {name}. Available: lolalytics, deeplol")
+
+
+async def serve(worker: int, jobs: multiprocessing.Queue, results: multiprocessing.Queue, concurrency: int,
+                manager_options: dict[str, Any], parser_options: dict[str, dict[str, Any]]):
+    """Worker loop: pulls jobs off the shared queue until it receives a None per consumer."""
+    from backend.workers.parser.helpers.browser_manager import BrowserManager
+
+    manager = BrowserManager(**manager_options)
+    parsers: dict[str, Any] = {}
+    setup_lock = asyncio.Lock()
+
+    async def get_parser(name: str):
+        async with setup_lock:
+            if name not in parsers:
+                parser = create_parser(name, manager, parser_options.get(name, {}))
+                await parser.setup()
+                parsers[name] = parser
+        return parsers[name]
+
+    async def consume():
+        while True:
+            item = await asyncio.to_thread(jobs.get)
+            if item is None: return
+
+            index, job = item
+            started = time.perf_counter()
+            with job_metrics() as metrics, job_trace() as trace:
+                try:
+                    parser = await get_parser(job.parser)
+                    result = JobResult(index=index, value=await getattr(parser, job.method)(**job.kwargs))
+                except Exception as e:
+                    logging.error(f"Worker {worker} failed job {index} ({job.parser}.{job.method}): {e}")
+                    result = JobResult(index=index, error=f"{type(e).__name__}: {e}")
+
+            result.worker, result.elapsed, result.metrics = worker, time.perf_counter() - started, metrics
+            if trace.calls: result.trace = trace
+            results.put(result)
+
+    try:
+        await asyncio.gather(*(consume() for _ in range(concurrency)))
+    finally:
+        for parser in parsers.values():
+            try:
+                await parser.close()
+            except Exception as e:
+                logging.debug(f"Failed to close parser: {e}")
+
+
+def worker_main(worker: int, jobs, results, concurrency: int, manager_options: dict[str, Any], parser_options: dict[str, dict[str, Any]]):
+    asyncio.run(serve(worker, jobs, results, concurrency, manager_options, parser_options))
+
+
+class ShardedRunner:
+    """Spreads jobs over ``processes`` workers, each driving its own Chromium with ``concurrency`` jobs in flight.
+
+    Every worker pulls from one shared queue, so a worker that finishes early takes the next pending job
+    instead of idling behind a slow shard. Results come back in job order:
+
+        runner = ShardedRunner(processes=4)
+        results = runner.run([Job("lolalytics", "parse_counters_stats", {"champion": c, "tier": "master_plus"}) for c in champions])
+
+    Workers are spawned rather than forked, since Playwright's driver connection does not survive a fork.
+    Pass ``manager_options={"endpoint": ...}`` to attach every worker to a browser_daemon instead, and
+    ``parser_options={"lolalytics": {"metrics": PageMetricsRecorder()}}`` to fill each result's ``metrics``
+    (or ``{"trace": ProtocolTrace()}`` for its ``trace``).
+    """
+
+    def __init__(self, processes: Optional[int] = None, concurrency: int = 2, manager_options: Optional[dict[str, Any]] = None,
+                 parser_options: Optional[dict[str, dict[str, Any]]] = None, poll_interval: float = 1.0):
+        self.processes = processes or os.cpu_count() or 1
+        self.concurrency = concurrency
+        self.manager_options = manager_options or {}
+        self.parser_options = parser_options or {}
+        self.poll_interval = poll_interval
+
+    def run(self, jobs: Iterable[Job]) -> list[JobResult]:
+        jobs = list(jobs)
+        if not jobs: return []
+
+        ctx = multiprocessing.get_context("spawn")
+        job_queue, result_queue = ctx.Queue(), ctx.Queue()
+        for item in enumerate(jobs): job_queue.put(item)
+        for _ in range(self.processes * self.concurrency): job_queue.put(None)
+
+        workers = [
+            ctx.Process(target=worker_main, args=(worker, job_queue, result_queue, self.concurrency, self.manager_options, self.parser_options), daemon=True)
+            for worker in range(self.processes)
+        ]
+        for process in workers: process.start()
+
+        results: dict[int, JobResult] = {}
+        try:
+            while len(results) < len(jobs):
+                try:
+                    result = result_queue.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    if not any(process.is_alive() for process in workers): break
+                    continue
+                results[result.index] = result
+        finally:
+            for process in workers: process.join(timeout=30)
+            for process in workers:
+                if process.is_alive(): process.terminate()
+
+        missing = len(jobs) - len(results)
+        if missing: logging.error(f"{missing} jobs lost to crashed workers")
+        return [results.get(index) or JobResult(index=index, error="worker exited before returning a result") for index in range(len(jobs))]
@@ -1,9 +1,12 @@
+import os
 import asyncio
+from helpers.browser_manager import BrowserManager
 from models.lolalytics_parser import LolalyticsParser
 from models.deeplol_parser import DeepLOLParser
 async def main():
 
-    parser = LolalyticsParser()
+    # Point PARSER_BROWSER_ENDPOINT at a running browser_daemon to skip launching Chromium
+    parser = LolalyticsParser(browser_manager=BrowserManager(endpoint=os.environ.get("PARSER_BROWSER_ENDPOINT")))
 
     try:
         await parser.setup()
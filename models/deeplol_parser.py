@@ -1,18 +1,75 @@
 """Deeplol.gg parser implementation."""
+import asyncio
 import logging
 from typing import Optional, List
 from backend.workers.parser.schemas.player import PlayerStats, RankInfo, SeasonStats, ChampionStats
 from backend.workers.parser.helpers.playwright_browser import PlaywrightBrowser
+from backend.workers.parser.helpers.browser_manager import BrowserManager
+from backend.workers.parser.helpers.route_policy import RoutePolicy, TRACKER_PATTERNS
+from backend.workers.parser.helpers.response_capture import ResponseCapture
+from backend.workers.parser.helpers.records import iter_containers, find_records, find_keyed, map_record
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
 
 class DeepLOLParser:
     """Parser implementation for DeepLOL.gg website using Playwright."""
 
-    def __init__(self):
-        """Initialize the parser instance."""
-        self.browser = PlaywrightBrowser()
-        self.page = None
+    CHAMPION_FIELDS = {
+        "position": ('td:nth-child(1) > span.normal', 'text'),
+        "champion": ('span.sc-JkixQ.eZQvao.champName', 'text'),
+        "champion_wins": ('span.win', 'number'),
+        "champion_losses": ('span.lose', 'number'),
+        "champion_wr": ('div.winrate', 'number'),
+        "champion_kda": ('div.kda > p', 'text'),
+        "champion_kda_ratio": ('span.kda_color', 'text'),
+        "champion_dmg_per_min": ('div.sc-jFkmsu.dZiPNg', 'number'),
+        "champion_dmg_share_ratio": ('td:nth-child(10) > span.normal', 'number'),
+        "champion_cs_per_min": ('td:nth-child(8) > span.normal', 'number'),
+    }
+
+    EXTRACTION_MODES = ("live", "snapshot", "network")
+
+    # API responses the React app renders its profile and champions tables from (see benchmarks/fixture_site.py)
+    PROFILE_API = "*/summoner/summoner*"
+    CHAMPIONS_API = "*/summoner/champion*"
+
+    # Candidate payload keys for each schema field, most specific first. Queues are matched exactly on Riot's
+    # queue type or id, and there is no generic "name" alias, since it appears on unrelated records too
+    NICKNAME_KEYS = ("riot_id_name", "summoner_name", "gameName", "nickname")
+    QUEUE_KEYS = {"solo": ("RANKED_SOLO_5x5", "solo", "420"), "flex": ("RANKED_FLEX_SR", "flex", "440")}
+    RANK_KEYS = {
+        "rank": ("tier", "rank_tier"),
+        "lp": ("lp", "league_points", "leaguePoints"),
+        "wins": ("wins", "win"),
+        "losses": ("losses", "lose"),
+        "win_rate": ("win_rate", "winRate"),
+    }
+    CHAMPION_KEYS = {
+        "position": ("position", "lane"),
+        "champion": ("champion_name", "championName"),
+        "champion_wins": ("wins", "win"),
+        "champion_losses": ("losses", "lose"),
+        "champion_wr": ("win_rate", "winRate"),
+        "champion_kda_ratio": ("kda",),
+        "champion_dmg_per_min": ("damage_per_min", "dpm"),
+        "champion_dmg_share_ratio": ("damage_share", "dmg_share"),
+        "champion_cs_per_min": ("cs_per_min", "cspm"),
+        "champion_gold_per_min": ("gold_per_min", "gpm"),
+    }
+    CHAMPION_REQUIRED = ("champion", "champion_wr")
+
+    def __init__(self, browser_manager: Optional[BrowserManager] = None, extraction: str = "live", **browser_options):
+        """Initialize the parser instance, optionally sharing a browser process with other parsers.
+
+        ``browser_options`` are passed to PlaywrightBrowser (max_pages, profile, user_data_dir, asset_cache...).
+
+        ``extraction="snapshot"`` reads each rendered view from a single HTML snapshot parsed offline.
+        ``extraction="network"`` maps the app's JSON API responses straight into the schemas as soon as
+        they arrive, falling back to the rendered DOM when a payload is missing or unrecognised.
+        """
+        if extraction not in self.EXTRACTION_MODES: raise ValueError(f"Unsupported extraction mode: {extraction}")
+        self.extraction = extraction
+        self.browser = PlaywrightBrowser(route_policy=RoutePolicy(block_url_patterns=TRACKER_PATTERNS + ("*youtube.com/embed*", "*twitch.tv*")), manager=browser_manager, **browser_options)
 
     async def setup(self):
         await self.browser.setup()
@@ -23,17 +80,17 @@ class DeepLOLParser:
     def normalize_url(self, url: str) -> tuple[str, str]:
         """Normalize DeepLOL.gg URL and generate champions URL."""
         url = url.rstrip('/')
-        if not url.startswith('https://'):
+        if not url.startswith(('https://', 'http://')):
             url = f'https://{url}'
         champions_url = f"{url}/champions"
 
         return url, champions_url
 
-    async def parse_wins_losses(self, selector: str) -> tuple[Optional[int], Optional[int]]:
+    async def parse_wins_losses(self, page, selector: str) -> tuple[Optional[int], Optional[int]]:
         """Parses the number of wins and losses from the 'XXXW YYYL' format element'"""
         text = None
         try:
-            text = (await self.browser.extract_text(selector) or "").strip()
+            text = (await self.browser.extract_text(selector, parent=page) or "").strip()
             if not text:
                 return None, None
 
@@ -58,32 +115,11 @@ class DeepLOLParser:
             await tab.click()
 
             await page.wait_for_selector('tr.close', timeout=10000)
-            rows = await page.query_selector_all('tr.close')
+            source = await self.browser.snapshot(page) if self.extraction == "snapshot" else page
+            rows = await self.browser.extract_rows('tr.close', self.CHAMPION_FIELDS, parent=source)
 
             for row in rows[1:]:
-                position = await  self.browser.extract_text('td:nth-child(1) > span.normal', parent=row)
-                champion = await self.browser.extract_text('span.sc-JkixQ.eZQvao.champName', parent=row)
-                champion_wins = await self.browser.extract_number('span.win', parent=row)
-                champion_losses = await self.browser.extract_number('span.lose', parent=row)
-                champion_wr = await self.browser.extract_number('div.winrate', parent=row)
-                champion_kda = await self.browser.extract_text('div.kda > p', parent=row)
-                champion_kda_ratio = await self.browser.extract_text('span.kda_color', parent=row)
-                champion_dmg_per_min = await self.browser.extract_number('div.sc-jFkmsu.dZiPNg',parent = row)
-                champion_dmg_share_ratio = await self.browser.extract_number('td:nth-child(10) > span.normal',parent = row)
-                champion_cs_per_min = await self.browser.extract_number('td:nth-child(8) > span.normal', parent=row)
-
-                champions.append(ChampionStats(
-                    position=position,
-                    champion=champion,
-                    champion_wins=champion_wins,
-                    champion_losses=champion_losses,
-                    champion_wr=champion_wr,
-                    champion_kda=champion_kda,
-                    champion_kda_ratio=champion_kda_ratio,
-                    champion_dmg_per_min=champion_dmg_per_min,
-                    champion_dmg_share_ratio=champion_dmg_share_ratio,
-                    champion_cs_per_min=champion_cs_per_min
-                ))
+                champions.append(ChampionStats(**row))
 
             return champions if champions else None
 
@@ -103,43 +139,105 @@ class DeepLOLParser:
             'wr': f'div.sc-iUKqMP.iKKtPF > div:nth-child({position}) div.sc-jcFjpl.dhxdJc span.sc-lvMlV.cFAxaZ'
         }
 
-    async def _parse_main_page(self, url: str):
-        """Parse main profile page."""
-        await self.page.goto(url, wait_until="domcontentloaded", timeout=10000)
-        await self.page.wait_for_selector('span.sc-kTwdzw.iERSzQ', timeout=10000)
+    async def _capture(self, page, url: str, name: str, pattern: str, timeout: float = 10.0):
+        """Navigates while sniffing for one JSON API response, returning its payload or None."""
+        async with ResponseCapture(page, {name: pattern}) as capture:
+            await page.goto(url, wait_until="commit", timeout=10000)
+            payloads = await capture.wait(timeout=timeout)
+        return payloads.get(name)
 
-        if await self.page.query_selector('div#anti-bot'):
+    def _queue_of(self, value) -> Optional[str]:
+        """Maps a queue type or id from a payload onto "solo" / "flex"."""
+        return next((mode for mode, keys in self.QUEUE_KEYS.items() if str(value) in keys), None)
+
+    def _apply_profile_payload(self, payload, stats: PlayerStats) -> bool:
+        """Fills nickname and current ranks from the profile payload; False unless it held at least one rank."""
+        if payload is None: return False
+
+        for container in iter_containers(payload):
+            if not isinstance(container, dict): continue
+
+            nickname = map_record(container, {"nickname": self.NICKNAME_KEYS}).get("nickname")
+            if nickname and not stats.nickname: stats.nickname = str(nickname)
+
+            queue = self._queue_of(container.get("queue_type") or container.get("queueType") or container.get("queue_id"))
+            rank = map_record(container, self.RANK_KEYS)
+            if not queue or "rank" not in rank: continue
+
+            try:
+                setattr(stats, f"current_rank_{queue}", RankInfo(**rank))
+            except Exception as e:
+                logging.warning(f"Failed to parse rank payload: {e}")
+
+        return stats.current_rank_solo is not None or stats.current_rank_flex is not None
+
+    def _apply_champions_payload(self, payload, stats: PlayerStats) -> bool:
+        """Fills per-queue champion stats from the champions payload; False when it is not recognised."""
+        if payload is None: return False
+
+        for mode, keys in self.QUEUE_KEYS.items():
+            queue = find_keyed(iter_containers(payload), keys)
+            records = find_records(iter_containers(queue), self.CHAMPION_KEYS, min_fields=3, required=self.CHAMPION_REQUIRED) if queue is not None else []
+            champions = []
+
+            for record in records:
+                try:
+                    champions.append(ChampionStats(**record))
+                except Exception as e:
+                    logging.warning(f"Failed to parse champion payload: {e}")
+
+            setattr(stats, f"champions_{mode}", champions or None)
+
+        return stats.champions_solo is not None or stats.champions_flex is not None
+
+    async def _parse_main_page(self, page, url: str, stats: PlayerStats):
+        """Parse main profile page into the lookup's stats."""
+        if self.extraction == "network":
+            if self._apply_profile_payload(await self._capture(page, url, "profile", self.PROFILE_API), stats): return
+            logging.info("Profile payload not usable, falling back to DOM")
+        else:
+            await page.goto(url, wait_until="domcontentloaded", timeout=10000)
+
+        await page.wait_for_selector('span.sc-kTwdzw.iERSzQ', timeout=10000)
+
+        if await page.query_selector('div#anti-bot'):
             raise Exception("Anti-bot protection detected")
 
         SOLO_SELECTORS = self.get_selectors_for_mode("solo")
         FLEX_SELECTORS = self.get_selectors_for_mode("flex")
+        source = await self.browser.snapshot(page) if self.extraction == "snapshot" else page
 
-        self.nickname = await self.browser.extract_text('span.sc-kTwdzw.iERSzQ')
-        self.current_rank_solo = await self._parse_rank_section(**SOLO_SELECTORS)
-        self.current_rank_flex = await self._parse_rank_section(**FLEX_SELECTORS)
+        stats.nickname = await self.browser.extract_text('span.sc-kTwdzw.iERSzQ', parent=source)
+        stats.current_rank_solo = await self._parse_rank_section(source, **SOLO_SELECTORS)
+        stats.current_rank_flex = await self._parse_rank_section(source, **FLEX_SELECTORS)
 
 
-    async def _parse_champions_page(self, url: str) -> Optional[List[ChampionStats]]:
-        """Parse champions tab in new page context."""
+    async def _parse_champions_page(self, page, url: str, stats: PlayerStats):
+        """Parse champions tab into the lookup's stats."""
         try:
-            await self.page.goto(url, wait_until="domcontentloaded", timeout=10000)
-            await self.page.wait_for_selector('tr.close', timeout=10000)
+            if self.extraction == "network":
+                if self._apply_champions_payload(await self._capture(page, url, "champions", self.CHAMPIONS_API), stats): return
+                logging.info("Champions payload not usable, falling back to DOM")
+            else:
+                await page.goto(url, wait_until="domcontentloaded", timeout=10000)
+
+            await page.wait_for_selector('tr.close', timeout=10000)
 
-            self.champions_solo = await self._parse_champion_data(self.page, mode="solo")
-            self.champions_flex = await self._parse_champion_data(self.page, mode="flex")
+            stats.champions_solo = await self._parse_champion_data(page, mode="solo")
+            stats.champions_flex = await self._parse_champion_data(page, mode="flex")
 
         except Exception as e:
             logging.error(f"Error parsing champions page: {e}")
             return None
 
 
-    async def _parse_rank_section(self, rank: str, lp: str, wl: str, wr: str) -> Optional[RankInfo]:
+    async def _parse_rank_section(self, page, rank: str, lp: str, wl: str, wr: str) -> Optional[RankInfo]:
         """Helper method to parse rank information from a section."""
         try:
-            rank = await self.browser.extract_text(rank)
-            lp = await self.browser.extract_number(lp)
-            wins, losses = await self.parse_wins_losses(wl)
-            win_rate = await self.browser.extract_number(wr)
+            rank = await self.browser.extract_text(rank, parent=page)
+            lp = await self.browser.extract_number(lp, parent=page)
+            wins, losses = await self.parse_wins_losses(page, wl)
+            win_rate = await self.browser.extract_number(wr, parent=page)
 
             return RankInfo(
                 rank=rank,
@@ -154,26 +252,42 @@ class DeepLOLParser:
             return None
 
 
+    async def _on_leased_page(self, parse, url: str, stats: PlayerStats):
+        """Runs one page parser on a page leased for it alone."""
+        async with self.browser.lease_page("parse_player_stats") as page:
+            return await parse(page, url, stats)
+
+
     async def parse_player_stats(self, url: str) -> Optional[PlayerStats]:
-        """Parse player stats from main page and champion stats from champions tab."""
+        """Parse player stats from main page and champion stats from champions tab, navigating both concurrently.
+
+        All per-lookup state lives in the returned PlayerStats, so concurrent calls on one parser are safe.
+        """
         try:
             base_url, champions_url = self.normalize_url(url)
-            self.page = await self.browser.new_page()
+            stats = PlayerStats()
 
-            await self._parse_main_page(base_url)
-            await self._parse_champions_page(champions_url)
+            # A TaskGroup cancels and awaits the other page when one fails instead of leaving it running
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._on_leased_page(self._parse_main_page, base_url, stats))
+                group.create_task(self._on_leased_page(self._parse_champions_page, champions_url, stats))
 
-            return PlayerStats(
-                nickname=self.nickname,
-                current_rank_solo=self.current_rank_solo,
-                current_rank_flex=self.current_rank_flex,
-                champions_solo=self.champions_solo,
-                champions_flex=self.champions_flex
-            )
+            return stats
 
         except Exception as e:
+            if isinstance(e, ExceptionGroup): e = e.exceptions[0]
             logging.error(f"Error parsing player stats: {e}")
             return None
-        finally:
-            if self.page:
-                await self.page.close()
\ No newline at end of file
+
+    async def parse_many(self, urls: List[str], concurrency: int = 4) -> List[Optional[PlayerStats]]:
+        """Parse several players on this parser's browser, at most ``concurrency`` lookups at a time.
+
+        Results keep the order of ``urls``; failed lookups are None.
+        """
+        slots = asyncio.Semaphore(concurrency)
+
+        async def parse_one(url: str) -> Optional[PlayerStats]:
+            async with slots:
+                return await self.parse_player_stats(url)
+
+        return list(await asyncio.gather(*(parse_one(url) for url in urls)))
@@ -1,49 +1,197 @@
 """Lolalytics.сom parser implementation."""
+import asyncio
 import logging
 from playwright.async_api import Page
 from typing import Optional, Callable, Any
 from backend.workers.parser.schemas.champion import *
 from backend.workers.parser.helpers.playwright_browser import PlaywrightBrowser
+from backend.workers.parser.helpers.browser_manager import BrowserManager
+from backend.workers.parser.helpers.route_policy import RoutePolicy
+from backend.workers.parser.helpers.html_snapshot import HtmlSnapshot
+from backend.workers.parser.helpers.http_fetcher import HttpFetcher
+from backend.workers.parser.helpers.qwik_state import QwikStateDecoder, extract_qwik_state
+from backend.workers.parser.helpers.records import find_records, find_keyed, map_record
+from backend.workers.parser.helpers.js_extractor import compile_extractor, compile_scroll_collector, field_spec, apply_transforms
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
 
 class LolalyticsParser:
     """Parser implementation for Lolalytics.сom website using Playwright."""
 
-    def __init__(self):
-        """Initialize the parser instance."""
-        self.browser = PlaywrightBrowser()
-        self.page = None
+    BASE_URL = "https://lolalytics.com/"
+    EXTRACTION_MODES = ("live", "snapshot", "state", "http")
+
+    # Candidate keys for each schema field in the Qwik state records, most specific first. Only the schema
+    # field names, their long forms and the site's own column labels (WR, PR, BR, Delta 1/2) are listed:
+    # no state payload has been captured yet, and short aliases would match unrelated records
+    META_STATE_KEYS = {
+        "name": ("name", "champion", "cname"),
+        "tier": ("tier",),
+        "lane": ("lane", "position"),
+        "win": ("wr", "win", "winRate"),
+        "pick": ("pr", "pick", "pickRate"),
+        "ban": ("br", "ban", "banRate"),
+        "games": ("games",),
+    }
+    COUNTER_STATE_KEYS = {
+        "champion": ("name", "champion", "cname"),
+        "wr_against": ("wr", "vsWr", "win"),
+        "delta_1": ("d1", "delta1"),
+        "delta_2": ("d2", "delta2"),
+        "avg_wr_against": ("avgWr", "wrAvg"),
+        "games": ("games",),
+    }
+    CARD_STATE_KEYS = {
+        "champion": ("name", "champion", "cname"),
+        "wr": ("wr", "win", "winRate"),
+        "delta_1": ("d1", "delta1"),
+        "delta_2": ("d2", "delta2"),
+        "pr": ("pr", "pick", "pickRate"),
+        "games": ("games",),
+    }
+    # Fields every state record must carry before the state is taken as the page's data
+    META_STATE_REQUIRED = ("name", "win")
+    COUNTER_STATE_REQUIRED = ("champion", "wr_against")
+    CARD_STATE_REQUIRED = ("champion", "wr")
+    OBJECTIVE_STATE_KEYS = {
+        "secure_percent": ("secure", "securePct"),
+        "secure_win_percent": ("secureWin", "secureWr"),
+        "yield_percent": ("yield", "yieldPct"),
+        "yield_win_percent": ("yieldWin", "yieldWr"),
+    }
+
+    def __init__(self, browser_manager: Optional[BrowserManager] = None, extraction: str = "live", base_url: Optional[str] = None, **browser_options):
+        """Initialize the parser instance, optionally sharing a browser process with other parsers.
+
+        ``browser_options`` are passed to PlaywrightBrowser (max_pages, profile, user_data_dir, asset_cache...).
+        ``base_url`` points every page at another host serving the same paths, such as benchmarks/fixture_site.py.
+
+        ``extraction="snapshot"`` reads the tier list and counters pages from a single HTML snapshot
+        parsed offline, releasing the page as soon as it is captured. ``extraction="state"`` decodes the
+        Qwik state embedded in the server-rendered HTML instead, trusting it only when every record carries
+        the champion name and win rate, and otherwise reads the DOM of the same page.
+        ``extraction="http"`` fetches the counters page, the only fully server-rendered one, over a pooled
+        aiohttp session and parses its state or markup without a browser. The tier list and build pages render
+        client-side, so under ``http`` they are read exactly as under ``state``.
+        """
+        if extraction not in self.EXTRACTION_MODES: raise ValueError(f"Unsupported extraction mode: {extraction}")
+        self.extraction = extraction
+        self.base_url = (base_url or self.BASE_URL).rstrip("/") + "/"
+        self.browser = PlaywrightBrowser(route_policy=RoutePolicy(block_resource_types=frozenset({"image", "font", "media", "manifest"})), manager=browser_manager, **browser_options)
+        self.http = HttpFetcher(harvester=lambda: self.browser.harvest_session(self.base_url)) if extraction == "http" else None
 
     async def setup(self):
         await self.browser.setup()
+        if self.http: await self.http.setup()
 
     async def close(self):
+        if self.http: await self.http.close()
         await self.browser.close()
 
-    async def parse_element(self, element, schema_cls, fields: dict[str, tuple[str, str, Optional[Callable[[Any], Any]]]]) -> Optional[Any]:
-        """Parses a given HTML element into an instance of the specified schema class"""
-        try:
-            values = {}
+    async def parse_elements(self, target, selector: str, schema_cls, fields: dict[str, tuple[str, str, Optional[Callable[[Any], Any]]]], skip: int = 0) -> list[Any]:
+        """Parses every element matching selector into schema instances with a single in-page call.
 
-            for field_name, (selector, value_type, transform) in fields.items():
-                if not selector: value = transform(None) if transform else None
-                elif value_type == "text": value = await self.browser.extract_text(selector, parent=element)
-                elif value_type == "number": value = await self.browser.extract_number(selector, parent=element)
-                else: raise ValueError(f"Unsupported value_type: {value_type}")
+        ``target`` may also be an HtmlSnapshot, in which case nothing is sent to the browser.
+        """
+        spec = field_spec(fields)
 
-                if transform: value = transform(value)
-                values[field_name] = value
+        if isinstance(target, HtmlSnapshot):
+            raw = target.extract(selector, spec)
+        else:
+            raw = await target.eval_on_selector_all(selector, compile_extractor(spec))
+            self.browser.record_bulk(len(raw), spec)
 
-            return schema_cls(**values)
+        return self._models(raw[skip:], schema_cls, fields)
 
-        except Exception as e:
-            logging.warning(f"Failed to parse element into {schema_cls.__name__}: {e}")
-            return None
+    @staticmethod
+    def _models(raw: list[list[Any]], schema_cls, fields: dict[str, tuple[str, str, Optional[Callable[[Any], Any]]]]) -> list[Any]:
+        """Builds schema instances from extracted value arrays, dropping the ones that fail validation."""
+        parsed = []
+
+        for values in raw:
+            try:
+                parsed.append(schema_cls(**apply_transforms(fields, values)))
+            except Exception as e:
+                logging.warning(f"Failed to parse element into {schema_cls.__name__}: {e}")
+
+        return parsed
+
+    @staticmethod
+    async def _open_for_state(page: Page, url: str) -> Optional[str]:
+        """Navigates a leased page and returns its server-rendered HTML as soon as the response arrives.
+
+        When the state is not usable the caller waits for ``domcontentloaded`` and reads the DOM of the same
+        page, so the state attempt never costs a second navigation.
+        """
+        response = await page.goto(url, wait_until="commit", timeout=30000)
+        return await response.text() if response else None
+
+    def _decode_state(self, html: Optional[str]) -> Optional[QwikStateDecoder]:
+        state = extract_qwik_state(html) if html else None
+        return QwikStateDecoder(state) if state else None
+
+    def _state_models(self, records: list[dict[str, Any]], schema_cls) -> list[Any]:
+        """Validates mapped state records, dropping the ones the schema rejects."""
+        parsed = []
+
+        for record in records:
+            try:
+                parsed.append(schema_cls(**record))
+            except Exception as e:
+                logging.warning(f"Failed to parse state record into {schema_cls.__name__}: {e}")
+
+        return parsed
+
+    def _state_lanes(self, groups: Any) -> Optional[list[dict[str, list]]]:
+        """Maps a lane -> cards mapping from the state into the common_matchup / common_teammates shape."""
+        if not isinstance(groups, dict): return None
+
+        lanes = []
+        for lane, cards in groups.items():
+            if not isinstance(cards, list): return None
+            records = [map_record(card, self.CARD_STATE_KEYS) for card in cards if isinstance(card, dict)]
+            if not records or any(name not in record for record in records for name in self.CARD_STATE_REQUIRED): return None
+            lanes.append({lane: self._state_models(records, CounterCardV2)})
+
+        return lanes or None
+
+    def _meta_from_state(self, html: Optional[str]) -> Optional[MetaStats]:
+        decoder = self._decode_state(html)
+        records = find_records(decoder.roots(), self.META_STATE_KEYS, min_fields=4, required=self.META_STATE_REQUIRED) if decoder else []
+        champions = self._state_models(records, MetaChampion)
+
+        return MetaStats(champions=champions) if champions else None
+
+    def _counters_from_state(self, html: Optional[str], champion: str) -> Optional[ChampionCounters]:
+        decoder = self._decode_state(html)
+        records = find_records(decoder.roots(), self.COUNTER_STATE_KEYS, min_fields=3, required=self.COUNTER_STATE_REQUIRED) if decoder else []
+        counters = self._state_models(records, CounterCard)
+
+        return ChampionCounters(champion=champion, counters=counters) if counters else None
+
+    def _counters_from_html(self, html: str, url: str, champion: str, cards: str, fields: dict) -> Optional[ChampionCounters]:
+        """Reads counters from a server-rendered page: its embedded state, else its card markup."""
+        stats = self._counters_from_state(html, champion)
+        if stats: return stats
+
+        counters = self._models(HtmlSnapshot(html, url).extract(cards, field_spec(fields)), CounterCard, fields)
+        return ChampionCounters(champion=champion, counters=counters) if counters else None
+
+    def _build_from_state(self, html: Optional[str], champion: str) -> Optional[ChampionStats]:
+        decoder = self._decode_state(html)
+        if not decoder: return None
+
+        common_matchup = self._state_lanes(find_keyed(decoder.roots(), ("matchup", "matchups")))
+        common_teammates = self._state_lanes(find_keyed(decoder.roots(), ("teammate", "teammates")))
+        objectives = find_keyed(decoder.roots(), ("objective", "objectives"))
+        if not (common_matchup and common_teammates and isinstance(objectives, dict)): return None
+
+        objectives = {name.lower(): ObjectiveInfo(**map_record(record, self.OBJECTIVE_STATE_KEYS)) for name, record in objectives.items() if isinstance(record, dict)}
+        return ChampionStats(champion=champion, objectives=objectives, common_matchup=common_matchup, common_teammates=common_teammates)
 
     async def parse_meta_stats(self, tier: str) -> Optional[MetaStats]:
         """Parse champion stats from Lolalytics."""
-        url = f"https://lolalytics.com/lol/tierlist/?tier={tier.lower()}"
+        url = f"{self.base_url}lol/tierlist/?tier={tier.lower()}"
 
         fields = {
             "name": ('div:nth-of-type(3)', 'text', None),
@@ -55,32 +203,37 @@ class LolalyticsParser:
             "games": ('div:nth-of-type(10)', 'number', None),
         }
 
+        rows = 'body > main > div:nth-of-type(6) > div'
+
         try:
-            self.page = await self.browser.new_page()
-            await self.page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await self.browser.auto_scroll()
+            async with self.browser.lease_page("parse_meta_stats") as page:
+                # The tier list rows load as the page scrolls, so its server markup only holds the first batch and
+                # is never fetched over HTTP: only the embedded state is complete, otherwise the scrolled DOM is read
+                if self.extraction in ("state", "http"):
+                    stats = self._meta_from_state(await self._open_for_state(page, url))
+                    if stats: return stats
+                    logging.info("Embedded state not usable for meta stats, falling back to DOM")
+                    await page.wait_for_load_state("domcontentloaded")
+                else:
+                    await page.goto(url, wait_until="domcontentloaded", timeout=30000)
 
-            rows = await self.page.query_selector_all('body > main > div:nth-of-type(6) > div')
-            if not rows: logging.error("Row selector not found")
+                await self.browser.auto_scroll(max_scrolls=200, page=page, until_stable=True, row_selector=rows)
 
-            champions = []
+                snapshot = await self.browser.snapshot(page) if self.extraction == "snapshot" else None
+                if not snapshot: champions = await self.parse_elements(page, rows, MetaChampion, fields, skip=2)
 
-            for row in rows[2:]:
-                stat = await self.parse_element(row, MetaChampion, fields)
-                if stat: champions.append(stat)
+            if snapshot: champions = await self.parse_elements(snapshot, rows, MetaChampion, fields, skip=2)
+            if not champions: logging.error("Row selector not found")
 
             return MetaStats(champions=champions)
 
         except Exception as e:
             logging.error(f"Error parsing meta stats: {e}")
             return None
-        finally:
-            if self.page:
-                await self.page.close()
 
     async def parse_counters_stats(self, champion: str, tier: str) -> Optional[ChampionCounters]:
         """Parse counter stats for specific champion stats from Lolalytics."""
-        url = f'https://lolalytics.com/lol/{champion.lower()}/counters/?tier={tier.lower()}'
+        url = f'{self.base_url}lol/{champion.lower()}/counters/?tier={tier.lower()}'
 
         fields = {
             "champion": ('div > a > div > div:nth-of-type(1)', 'text', None),
@@ -91,68 +244,152 @@ class LolalyticsParser:
             "games": ('div > a > div > div:nth-of-type(5)', 'number', None),
         }
 
-        try:
-            self.page = await self.browser.new_page()
-            await self.page.goto(url, wait_until="domcontentloaded", timeout=30000)
-
-            cards = await self.page.query_selector_all('div.flex.flex-wrap.justify-between > span')
-            if not cards: logging.error("Card selector not found")
-
-            champion = champion
-            counters = []
+        cards = 'div.flex.flex-wrap.justify-between > span'
 
-            for card in cards:
-                stat = await self.parse_element(card, CounterCard, fields)
-                if stat: counters.append(stat)
+        try:
+            if self.http:
+                # Counters are fully server-rendered, so this page can be served from its state or markup without a browser.
+                # A body without counters (consent or challenge page) counts as a failed fetch towards re-harvesting
+                stats = await self.http.fetch(url, parse=lambda html: self._counters_from_html(html, url, champion, cards, fields))
+                if stats: return stats
+                logging.info("HTTP response not usable for counter stats, falling back to browser")
+
+            async with self.browser.lease_page("parse_counters_stats") as page:
+                if self.extraction in ("state", "http"):
+                    stats = self._counters_from_state(await self._open_for_state(page, url), champion)
+                    if stats: return stats
+                    logging.info("Embedded state not usable for counter stats, falling back to DOM")
+                    await page.wait_for_load_state("domcontentloaded")
+                else:
+                    await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+
+                snapshot = await self.browser.snapshot(page) if self.extraction == "snapshot" else None
+                if not snapshot: counters = await self.parse_elements(page, cards, CounterCard, fields)
+
+            if snapshot: counters = await self.parse_elements(snapshot, cards, CounterCard, fields)
+            if not counters: logging.error("Card selector not found")
 
             return ChampionCounters(champion=champion, counters=counters)
 
         except Exception as e:
             logging.error(f"Error parsing counter stats: {e}")
             return None
-        finally:
-            if self.page:
-                await self.page.close()
 
-    async def parse_common_section(self, page: Page, flag: str, counter_fields: dict, parse_element_func: Callable) -> list[dict[str, list]]:
-        """Parses a scrolling section of champion cards (e.g., common matchups or teammates) from the page."""
-        await self.page.wait_for_selector('div.cursor-grab', timeout=10000)
-        scroll_containers = await self.page.query_selector_all('div.cursor-grab')
-        positions = await self.page.query_selector_all('body > main > div.m-auto > div > div > div > img')
+    async def parse_common_section(self, page: Page, flag: str, counter_fields: dict, delay: float = 0.15, deadline: float = 10.0) -> list[dict[str, list]]:
+        """Parses a scrolling section of champion cards (e.g., common matchups or teammates) from the page.
+
+        Every carousel is scrolled to its end and collected in-page, so the section costs a fixed number of
+        round trips regardless of how many cards it holds.
+        """
+        await page.wait_for_selector('div.cursor-grab', timeout=10000)
+        lanes = await page.eval_on_selector_all('body > main > div.m-auto > div > div > div > img', '(imgs) => imgs.map((img) => img.getAttribute("alt"))')
+
+        spec = field_spec(counter_fields)
+        collector = compile_scroll_collector(spec, ':scope > div > div')
+        carousels = await page.eval_on_selector_all('div.cursor-grab', collector, {"delay": delay * 1000, "deadline": deadline * 1000})
 
         common_data = []
 
-        for i in range(len(positions)):
-            curr_lane = await positions[i].get_attribute("alt")
+        for curr_lane, cards in zip(lanes, carousels):
+            self.browser.record_bulk(len(cards), spec)
             seen_champions = set()
             counters = []
 
-            while True:
-                await scroll_containers[i].evaluate('(el) => el.scrollLeft += (el.clientWidth - 100)')
-                cards = await self.page.query_selector_all(f'div.m-auto.w-\[98\%\] > div.w-\[100\%\] > div:nth-child({2 + i}) > div.cursor-grab > div > div')
-
-                for card in cards:
-                    link = await (await card.query_selector("a")).get_attribute("href")
-                    champ = None
-                    if flag == 'teammates': champ = link.split("/")[2].capitalize()
-                    elif flag == 'matchup': champ = link.split("/")[4].capitalize()
-
-                    if champ in seen_champions: continue
+            for link, *values in cards:
+                champ = None
+                if flag == 'teammates': champ = link.split("/")[2].capitalize()
+                elif flag == 'matchup': champ = link.split("/")[4].capitalize()
 
-                    seen_champions.add(champ)
-                    counter_fields['champion'] = (None, None, lambda _: champ)
-                    parsed = await parse_element_func(card, CounterCardV2, counter_fields)
-                    counters.append(parsed)
+                if champ in seen_champions: continue
+                seen_champions.add(champ)
 
-                if await page.evaluate('(el) => el.scrollLeft + el.clientWidth >= el.scrollWidth - 5', scroll_containers[i]): break
+                try:
+                    counters.append(CounterCardV2(**apply_transforms(counter_fields, values), champion=champ))
+                except Exception as e:
+                    logging.warning(f"Failed to parse element into {CounterCardV2.__name__}: {e}")
 
             common_data.append({curr_lane: counters})
 
         return common_data
 
-    async def parse_champion_build(self, champion: str, tier: str) -> Optional[ChampionStats]:
-        """Parses detailed champion build statistics from Lolalytics."""
-        url = f'https://lolalytics.com/lol/{champion.lower()}/build/?tier={tier.lower()}'
+    async def _show_teammates(self, page: Page):
+        """Switches the build page carousels from matchups to teammates and waits for them to re-render."""
+        first_card = 'body > main > div.m-auto > div > div:nth-child(2) > div.cursor-grab.overflow-y-hidden.overflow-x-scroll > div > div:nth-child(1) > a'
+
+        await page.wait_for_selector(first_card, timeout=10000)
+        old_check = await (await page.query_selector(first_card)).text_content()
+
+        await page.click("body > main > div > div > div:nth-child(1) > div:nth-child(2) > div.flex.flex-auto.justify-items-stretch > div:nth-child(1)")
+
+        await page.wait_for_function(
+            """(args) => {
+                const el = document.querySelector(args.selector);
+                return el && el.textContent.trim() !== args.oldCheck;
+            }""",
+            arg={
+                "selector": first_card,
+                "oldCheck": old_check.strip() if old_check else ""
+            },
+            timeout=10000
+        )
+
+    async def _parse_objectives(self, page: Page) -> dict[str, ObjectiveInfo]:
+        """Parses the objectives table of a build page."""
+        rows = await page.eval_on_selector_all('div.mb-2.break-inside-avoid > table > tbody > tr', '(rows) => rows.map((row) => Array.from(row.querySelectorAll("td"), (td) => td.textContent))')
+        if not rows: logging.error("Objective selector not found")
+
+        objectives = {}
+
+        for tds in rows:
+            name = tds[0].lower()
+            secure_percent = tds[1]
+            secure_win_percent = tds[2]
+            yield_percent = tds[3] if len(tds) > 3 else None
+            yield_win_percent = tds[4] if len(tds) > 4 else None
+
+            objectives[name] = ObjectiveInfo(secure_percent=secure_percent, secure_win_percent=secure_win_percent, yield_percent=yield_percent, yield_win_percent=yield_win_percent)
+
+        return objectives
+
+    async def _open_build_page(self, page: Page, url: str, navigated: bool = False):
+        """Opens a build page (or finishes loading one ``navigated`` for its state) and nudges its lazy sections into rendering."""
+        if navigated: await page.wait_for_load_state("domcontentloaded")
+        else: await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        await self.browser.auto_scroll(max_scrolls=5, page=page, until_stable=True)
+
+    async def _parse_build_page(self, page: Page, champion: str, counter_fields: dict) -> ChampionStats:
+        """Parses matchups, objectives and then teammates on one opened build page by toggling between them."""
+        common_matchup = await self.parse_common_section(page=page, flag='matchup', counter_fields=counter_fields)
+        objectives = await self._parse_objectives(page)
+        await self._show_teammates(page)
+        common_teammates = await self.parse_common_section(page=page, flag='teammates', counter_fields=counter_fields)
+
+        return ChampionStats(champion=champion, objectives=objectives, common_matchup=common_matchup, common_teammates=common_teammates)
+
+    async def _parse_build_matchups(self, url: str, counter_fields: dict) -> tuple[list, dict[str, ObjectiveInfo]]:
+        """Parses common matchups and objectives on a page of its own."""
+        async with self.browser.lease_page("parse_champion_build") as page:
+            await self._open_build_page(page, url)
+            common_matchup = await self.parse_common_section(page=page, flag='matchup', counter_fields=counter_fields)
+            objectives = await self._parse_objectives(page)
+
+            return common_matchup, objectives
+
+    async def _parse_build_teammates(self, url: str, counter_fields: dict) -> list:
+        """Parses common teammates on a page of its own."""
+        async with self.browser.lease_page("parse_champion_build") as page:
+            await self._open_build_page(page, url)
+            await self._show_teammates(page)
+
+            return await self.parse_common_section(page=page, flag='teammates', counter_fields=counter_fields)
+
+    async def parse_champion_build(self, champion: str, tier: str, parallel: bool = True) -> Optional[ChampionStats]:
+        """Parses detailed champion build statistics from Lolalytics.
+
+        With ``parallel`` the matchup and teammate carousels are scraped concurrently on two leased pages,
+        otherwise sequentially on one page by toggling between them, as is the state mode's DOM fallback.
+        """
+        url = f'{self.base_url}lol/{champion.lower()}/build/?tier={tier.lower()}'
 
         counter_fields = {
             "wr": ('div.my-1:nth-child(2)', 'text', None),
@@ -163,51 +400,29 @@ class LolalyticsParser:
         }
 
         try:
-            self.page = await self.browser.new_page()
-            await self.page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await self.browser.auto_scroll(max_scrolls=5)
-
-            common_matchup = await self.parse_common_section(page=self.page, flag='matchup', counter_fields=counter_fields, parse_element_func=self.parse_element)
-            await self.page.wait_for_selector('body > main > div.m-auto > div > div:nth-child(2) > div.cursor-grab.overflow-y-hidden.overflow-x-scroll > div > div:nth-child(1) > a', timeout=10000)
-            old_check = await (await self.page.query_selector('body > main > div.m-auto > div > div:nth-child(2) > div.cursor-grab.overflow-y-hidden.overflow-x-scroll > div > div:nth-child(1) > a')).text_content()
-
-            await self.page.click("body > main > div > div > div:nth-child(1) > div:nth-child(2) > div.flex.flex-auto.justify-items-stretch > div:nth-child(1)")
-
-            await self.page.wait_for_function(
-                """(args) => {
-                    const el = document.querySelector(args.selector);
-                    return el && el.textContent.trim() !== args.oldCheck;
-                }""",
-                arg={
-                    "selector": "body > main > div.m-auto > div > div:nth-child(2) > div.cursor-grab.overflow-y-hidden.overflow-x-scroll > div > div:nth-child(1) > a",
-                    "oldCheck": old_check.strip() if old_check else ""
-                },
-                timeout=10000
-            )
-
-            common_teammates = await self.parse_common_section(page=self.page, flag = 'teammates', counter_fields=counter_fields, parse_element_func=self.parse_element)
-
-            rows = await self.page.query_selector_all('div.mb-2.break-inside-avoid > table > tbody > tr')
-            if not rows: logging.error("Objective selector not found")
-
-            objectives = {}
-
-            for row in rows:
-                tds = await row.query_selector_all("td")
-
-                name = (await tds[0].text_content()).lower()
-                secure_percent = await tds[1].text_content()
-                secure_win_percent = await tds[2].text_content()
-                yield_percent = await tds[3].text_content() if len(tds) > 3 else None
-                yield_win_percent = await tds[4].text_content() if len(tds) > 4 else None
-
-                objectives[name] = ObjectiveInfo(secure_percent=secure_percent, secure_win_percent=secure_win_percent, yield_percent=yield_percent, yield_win_percent=yield_win_percent)
-
-            return ChampionStats(champion=champion, objectives=objectives, common_matchup=common_matchup, common_teammates=common_teammates)
+            # The carousels render client-side, so like the tier list the build page is never fetched over HTTP
+            if self.extraction in ("state", "http"):
+                async with self.browser.lease_page("parse_champion_build") as page:
+                    stats = self._build_from_state(await self._open_for_state(page, url), champion)
+                    if stats: return stats
+                    # Falls back on the page already open: leasing a second one while holding it could deadlock a full pool
+                    logging.info("Embedded state not usable for build stats, falling back to DOM")
+                    await self._open_build_page(page, url, navigated=True)
+                    return await self._parse_build_page(page, champion, counter_fields)
+
+            if parallel:
+                # A TaskGroup cancels and awaits the sibling page when one side fails, so no lease is left running
+                async with asyncio.TaskGroup() as group:
+                    matchups = group.create_task(self._parse_build_matchups(url, counter_fields))
+                    teammates = group.create_task(self._parse_build_teammates(url, counter_fields))
+                (common_matchup, objectives), common_teammates = matchups.result(), teammates.result()
+                return ChampionStats(champion=champion, objectives=objectives, common_matchup=common_matchup, common_teammates=common_teammates)
+
+            async with self.browser.lease_page("parse_champion_build") as page:
+                await self._open_build_page(page, url)
+                return await self._parse_build_page(page, champion, counter_fields)
 
         except Exception as e:
+            if isinstance(e, ExceptionGroup): e = e.exceptions[0]
             logging.error(f"Error parsing build stats: {e}")
             return None
-        finally:
-            if self.page:
-                await self.page.close()
\ No newline at end of file